@@ -74,7 +74,7 @@ class Edge:
 
 class AdjacencyListGraph:
 
-	def __init__(self, card_V, directed=True, weighted=False):
+	def __init__(self, card_V, directed=True, weighted=False, indexed=False):
 		"""Initialize a graph implemented by an adjacency list. Vertices are
 		numbered from 0, so that adj_list[i] corresponds to adjacency list of vertex i.
 
@@ -82,15 +82,22 @@ class AdjacencyListGraph:
 		card_V -- number of vertices in this graph
 		directed -- boolean indicating whether the graph is directed
 		weighted -- boolean indicating whether edges are weighted
+		indexed -- boolean indicating whether to keep a dictionary per vertex that maps
+		each neighbor to its linked-list node, so that finding, inserting and deleting
+		an edge take O(1) expected time instead of time linear in the degree
 		"""
 		self.directed = directed
 		self.weighted = weighted
+		self.indexed = indexed
 		self.adj_lists = [None] * card_V
 		for i in range(card_V):
 			# Each adjacency list is implemented as a linked list.
 			self.adj_lists[i] = DLLSentinel(get_key_func=Edge.get_v)  # will be a list of Edge objects
+		# The linked lists still give the iteration order; the index only speeds up lookups.
+		self.edge_index = [{} for i in range(card_V)] if indexed else None
 		self.card_V = card_V
 		self.card_E = 0
+		self.version = 0  # bumped whenever an edge is inserted, deleted or reweighted
 
 	def get_card_V(self):
 		"""Return the number of vertices in this graph."""
@@ -116,6 +123,16 @@ class AdjacencyListGraph:
 		"""Return a boolean indicating whether this graph is weighted."""
 		return self.weighted
 
+	def is_indexed(self):
+		"""Return a boolean indicating whether edge lookups go through a hash index."""
+		return self.indexed
+
+	def get_version(self):
+		"""Return a counter that changes whenever an edge is inserted, deleted or reweighted
+		with set_weight, so that results computed from this graph can tell whether they
+		are out of date."""
+		return self.version
+
 	def insert_edge(self, u, v, weight=None):
 		"""Insert an edge between vertices u and v.
 
@@ -138,19 +155,30 @@ class AdjacencyListGraph:
 		# Cannot insert multiple edges between two vertices.
 		if self.has_edge(u, v):
 			raise RuntimeError("An edge (" + str(u) + ", " + str(v) + ") already exists.")
-		self.adj_lists[u].append(Edge(v, weight))
+		node = self.adj_lists[u].append(Edge(v, weight))
+		if self.indexed:
+			self.edge_index[u][v] = node
 		self.card_E += 1
+		self.version += 1
 
 		# If this graph is undirected, insert an edge from v to u.
 		if not self.directed:
 			# Cannot insert multiple edges between two vertices.
 			if self.has_edge(v, u):
 				raise RuntimeError("An edge (" + str(v) + ", " + str(u) + ") already exists.")
-			self.adj_lists[v].append(Edge(u, weight))
+			node = self.adj_lists[v].append(Edge(u, weight))
+			if self.indexed:
+				self.edge_index[v][u] = node
+
+	def search_adj_list(self, u, v):
+		"""Return the linked-list node holding edge (u, v), or None if there is no such edge."""
+		if self.indexed:
+			return self.edge_index[u].get(v)
+		return self.adj_lists[u].search(v)
 
 	def find_edge(self, u, v):
 		"""Return the edge object for edge (u, v) if (u, v) is in this graph, None otherwise."""
-		edge = self.adj_lists[u].search(v)
+		edge = self.search_adj_list(u, v)
 		if edge is None:
 			return None
 		else:
@@ -160,25 +188,51 @@ class AdjacencyListGraph:
 		"""Return True if edge (u, v) is in this graph, False otherwise."""
 		return self.find_edge(u, v) is not None
 
+	def set_weight(self, u, v, weight):
+		"""Set the weight of edge (u, v), which must exist, in both directions if this
+		graph is undirected."""
+		if not self.weighted:
+			raise RuntimeError("Setting the weight of edge (" + str(u) + ", " + str(v) + ") in unweighted graph.")
+		edge = self.find_edge(u, v)
+		if edge is None:
+			raise RuntimeError("There is no edge (" + str(u) + ", " + str(v) + ").")
+		edge.set_weight(weight)
+		if not self.directed:
+			self.find_edge(v, u).set_weight(weight)
+		self.version += 1
+
 	def delete_edge(self, u, v, delete_undirected=True):
 		"""Delete edge (u, v) if it exists.  No error if it does not exist.
 			Delete both directions if the graph is undirected and delete_undirected is True."""
-		edge = self.adj_lists[u].search(v)
+		edge = self.search_adj_list(u, v)
 		if edge is not None:
 			self.adj_lists[u].delete(edge)
+			if self.indexed:
+				del self.edge_index[u][v]
 			self.card_E -= 1
+			self.version += 1
 
 		if not self.directed and delete_undirected:
-			edge = self.adj_lists[v].search(u)
+			edge = self.search_adj_list(v, u)
 			if edge is not None:
 				self.adj_lists[v].delete(edge)
+				if self.indexed:
+					del self.edge_index[v][u]
+				self.version += 1
 
 	def copy(self):
 		"""Return a copy of this graph."""
-		copy = AdjacencyListGraph(self.card_V, self.directed, self.weighted)
+		copy = AdjacencyListGraph(self.card_V, self.directed, self.weighted, self.indexed)
 		copy.card_E = self.card_E
 		for u in range(self.card_V):
 			copy.adj_lists[u] = self.adj_lists[u].copy()
+			if self.indexed:
+				# Index the nodes of the new list, walking it from the head.
+				sentinel = copy.adj_lists[u].sentinel
+				x = sentinel.next
+				while x is not sentinel:
+					copy.edge_index[u][x.data.get_v()] = x
+					x = x.next
 		return copy
 
 	def get_edge_list(self):
@@ -194,7 +248,7 @@ class AdjacencyListGraph:
 
 	def transpose(self):
 		"""Return the transpose of this graph."""
-		xpose = AdjacencyListGraph(self.card_V, self.directed, self.weighted)
+		xpose = AdjacencyListGraph(self.card_V, self.directed, self.weighted, self.indexed)
 		for u in range(self.card_V):
 			adj_list = self.get_adj_list(u)
 			for edge in adj_list:
@@ -214,7 +268,9 @@ class AdjacencyListGraph:
 		for u in range(card_V):
 			adj_list = self.get_adj_list(u)
 			for edge in adj_list:
-				matrix.insert_edge(u, edge.get_v(), weight_func(edge))
+				# An undirected edge is in both adjacency lists but is inserted into the matrix once.
+				if self.directed or u < edge.get_v():
+					matrix.insert_edge(u, edge.get_v(), weight_func(edge))
 		return matrix
 
 	def __str__(self):
@@ -311,3 +367,18 @@ if __name__ == "__main__":
 	# Test transpose.
 	xpose1 = graph1.transpose()
 	print(xpose1)
+
+	# Indexed adjacency lists give the same graph, with constant-time lookups.
+	graph4 = AdjacencyListGraph(10, directed=False, indexed=True)
+	for i in range(0, len(array1) - 1, 2):
+		try:
+			graph4.insert_edge(array1[i], array1[i + 1])
+		except RuntimeError as e:
+			print(e)
+	print(graph4.strmap() == graph2.strmap())
+	graph5 = graph4.copy()
+	graph5.insert_edge(*missing_edge)
+	print(graph5.has_edge(*missing_edge), graph5.has_edge(*(missing_edge[::-1])), graph4.has_edge(*missing_edge))
+	graph5.delete_edge(*missing_edge)
+	print(graph5.strmap() == graph4.strmap())
+	print(graph5.get_card_E() == graph4.get_card_E())
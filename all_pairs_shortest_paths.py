@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# all_pairs_shortest_paths.py
+
+import numpy as np
+
+
+def weight_matrix(G):
+	"""Return the weight matrix of a graph as a float NumPy array, with 0 on the
+	diagonal and infinity where there is no edge.
+
+	Arguments:
+	G -- an AdjacencyMatrixGraph, or any graph with an adjacency_matrix() method
+	"""
+	if not hasattr(G, "get_adj_matrix"):
+		G = G.adjacency_matrix()
+	adj_matrix = G.get_adj_matrix()
+	if G.is_weighted():
+		W = np.array(adj_matrix, dtype=float)  # no edge is already infinity
+	else:
+		W = np.where(adj_matrix != 0, 1.0, np.inf)  # no edge is 0 in an unweighted graph
+	np.fill_diagonal(W, 0)
+	return W
+
+
+def floyd_warshall(W, next_hop=False):
+	"""Solve the all-pairs shortest-paths problem with the Floyd-Warshall algorithm.
+	Each of the card_V iterations relaxes every pair through intermediate vertex k
+	as a single vectorized update D = min(D, D[:, k] + D[k, :]).
+
+	Arguments:
+	W -- square weight matrix with 0 on the diagonal and infinity for no edge
+	next_hop -- boolean indicating whether to also return the next-hop matrix
+	Assumption:
+	No negative-weight cycles
+
+	Returns:
+	D -- D[i, j] is the shortest-path weight from i to j
+	N -- only if next_hop: N[i, j] is the vertex after i on a shortest path
+	from i to j, or -1 if there is none
+	"""
+	D = np.array(W, dtype=float)
+	card_V = D.shape[0]
+	if next_hop:
+		N = np.where(np.isfinite(D), np.arange(card_V)[None, :], -1)
+		np.fill_diagonal(N, np.arange(card_V))
+	for k in range(card_V):
+		through_k = D[:, k, None] + D[None, k, :]
+		if next_hop:
+			improved = through_k < D
+			N = np.where(improved, N[:, k, None], N)
+		np.minimum(D, through_k, out=D)
+	if next_hop:
+		return D, N
+	return D
+
+
+def stop_counts(W):
+	"""Return the matrix of fewest edges between each pair of vertices.  All sources are
+	searched breadth-first at once: multiplying the 0/1 frontier matrix by the 0/1
+	adjacency matrix gives every vertex one more edge away, which is the min-plus
+	product for unit weights carried out as an ordinary (BLAS) matrix product.
+
+	Arguments:
+	W -- square weight matrix with infinity for no edge; only its pattern is used
+	"""
+	card_V = W.shape[0]
+	A = (np.isfinite(W) & ~np.eye(card_V, dtype=bool)).astype(np.float32)
+	D = np.full((card_V, card_V), np.inf)
+	np.fill_diagonal(D, 0)
+	reached = np.eye(card_V, dtype=bool)
+	frontier = np.eye(card_V, dtype=np.float32)
+	level = 0
+	while frontier.any():
+		level += 1
+		discovered = (frontier @ A > 0) & ~reached  # vertices first reached with level edges
+		D[discovered] = level
+		reached |= discovered
+		frontier = discovered.astype(np.float32)
+	return D
+
+
+def path_from_next_hop(N, i, j):
+	"""Return the shortest path from i to j as a list of vertices, using the next-hop
+	matrix from floyd_warshall.  Returns [] if there is no path."""
+	if N[i, j] < 0:
+		return []
+	path = [i]
+	while i != j:
+		i = int(N[i, j])
+		path.append(i)
+	return path
+
+
+def upper_triangle_values(D):
+	"""Return the finite entries above the diagonal of a symmetric distance matrix as a
+	list, one per unordered pair of distinct vertices, ready for a histogram."""
+	values = D[np.triu_indices(D.shape[0], k=1)]
+	return values[np.isfinite(values)].tolist()
+
+
+# Testing
+if __name__ == "__main__":
+
+	import random
+	from adjacency_list_graph import AdjacencyListGraph
+	from dijkstra import dijkstra
+	from bfs import bfs
+
+	random.seed(1828)
+	card_V = 120
+	graph1 = AdjacencyListGraph(card_V, False, True)
+	for u in range(card_V):
+		for v in range(u + 1, card_V):
+			if random.random() < 0.03:
+				graph1.insert_edge(u, v, random.randint(1, 10))
+	W = weight_matrix(graph1)
+	D, N = floyd_warshall(W, next_hop=True)
+	S = stop_counts(W)
+
+	# Distances and stop counts must agree with the single-source algorithms.
+	all_equal = True
+	for s in range(card_V):
+		if dijkstra(graph1, s)[0] != D[s].tolist() or bfs(graph1, s)[0] != S[s].tolist():
+			all_equal = False
+		for t in range(card_V):
+			path = path_from_next_hop(N, s, t)
+			if path and sum(graph1.find_edge(path[i], path[i + 1]).get_weight()
+							for i in range(len(path) - 1)) != D[s, t]:
+				all_equal = False
+	print("All all-pairs distances are " + ("not " if not all_equal else "") + "equal")
+	print(len(upper_triangle_values(D)))
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# astar.py
+
+from heapq import heappush, heappop
+import numpy as np
+from dijkstra import dijkstra_lazy
+
+
+class Landmarks:
+
+	def __init__(self, landmarks, distances_from, distances_to=None):
+		"""Initialize the ALT (A*, landmarks, triangle inequality) lower-bound tables.
+
+		Arguments:
+		landmarks -- list of landmark vertex indices
+		distances_from -- distances_from[i][v] is the distance from landmarks[i] to v
+		distances_to -- distances_to[i][v] is the distance from v to landmarks[i];
+		None for an undirected graph, where it equals distances_from
+		"""
+		self.landmarks = [int(l) for l in landmarks]
+		self.distances_from = np.asarray(distances_from, dtype=float)
+		self.distances_to = None if distances_to is None else np.asarray(distances_to, dtype=float)
+
+		# Keep each vertex's distances as a tuple, which is much faster to read from
+		# Python loops than rows of a NumPy array.
+		self.rows_from = [tuple(column) for column in self.distances_from.T.tolist()]
+		if self.distances_to is None:
+			self.rows_to = self.rows_from
+		else:
+			self.rows_to = [tuple(column) for column in self.distances_to.T.tolist()]
+
+	def get_landmarks(self):
+		"""Return the list of landmark vertices."""
+		return self.landmarks
+
+	def lower_bound(self, v, t):
+		"""Return a lower bound on the distance from v to t, by the triangle inequality.
+		Landmarks that cannot reach both vertices give no information."""
+		inf = float('inf')
+		bound = 0
+		from_v, from_t = self.rows_from[v], self.rows_from[t]
+		to_v, to_t = self.rows_to[v], self.rows_to[t]
+		for i in range(len(self.landmarks)):
+			# d(L, t) <= d(L, v) + d(v, t)
+			if from_t[i] != inf and from_v[i] != inf and from_t[i] - from_v[i] > bound:
+				bound = from_t[i] - from_v[i]
+			# d(v, L) <= d(v, t) + d(t, L)
+			if to_v[i] != inf and to_t[i] != inf and to_v[i] - to_t[i] > bound:
+				bound = to_v[i] - to_t[i]
+		return bound
+
+	def save(self, file_path):
+		"""Save the landmarks and distance tables to a NumPy .npz file."""
+		if self.distances_to is None:
+			np.savez(file_path, landmarks=self.landmarks, distances_from=self.distances_from)
+		else:
+			np.savez(file_path, landmarks=self.landmarks, distances_from=self.distances_from,
+					 distances_to=self.distances_to)
+
+	@staticmethod
+	def load(file_path):
+		"""Load landmarks and distance tables saved by save()."""
+		with np.load(file_path) as tables:
+			distances_to = tables["distances_to"] if "distances_to" in tables else None
+			return Landmarks(tables["landmarks"].tolist(), tables["distances_from"], distances_to)
+
+
+def select_landmarks(G, k):
+	"""Choose k landmarks by farthest-point selection.  The first landmark is the vertex
+	farthest from vertex 0, and each further landmark is the vertex farthest from all the
+	landmarks chosen so far.  Unreachable vertices are skipped.
+
+	Arguments:
+	G -- a weighted graph with nonnegative weights
+	k -- number of landmarks to choose
+
+	Returns:
+	landmarks -- list of landmark vertices
+	distances -- distances[i] holds the distances from landmarks[i], as found by dijkstra_lazy
+	"""
+	card_V = G.get_card_V()
+	k = min(k, card_V)
+	nearest, pi = dijkstra_lazy(G, 0)  # nearest[v] is v's distance to the closest landmark
+	landmarks = []
+	distances = []
+	while len(landmarks) < k:
+		# Pick the reachable vertex that is farthest from every landmark so far.
+		candidate = None
+		for v in range(card_V):
+			if nearest[v] != float('inf') and v not in landmarks and \
+					(candidate is None or nearest[v] > nearest[candidate]):
+				candidate = v
+		if candidate is None:
+			break
+		d, pi = dijkstra_lazy(G, candidate)
+		landmarks.append(candidate)
+		distances.append(d)
+		if len(landmarks) == 1:
+			nearest = d  # vertex 0 itself is not a landmark, so forget its distances
+		else:
+			nearest = [min(nearest[v], d[v]) for v in range(card_V)]
+	return landmarks, distances
+
+
+def preprocess_landmarks(G, k=8, file_path=None):
+	"""Offline preprocessing for ALT: choose k landmarks and compute their distance tables.
+
+	Arguments:
+	G -- a weighted graph with nonnegative weights
+	k -- number of landmarks
+	file_path -- optional .npz file to save the tables to
+
+	Returns:
+	landmarks -- a Landmarks object for use with astar
+	"""
+	landmarks, distances_from = select_landmarks(G, k)
+	distances_to = None
+	if G.is_directed():
+		# Distances to a landmark are distances from it in the transpose.
+		G_reverse = G.transpose()
+		distances_to = [dijkstra_lazy(G_reverse, l)[0] for l in landmarks]
+	result = Landmarks(landmarks, distances_from, distances_to)
+	if file_path is not None:
+		result.save(file_path)
+	return result
+
+
+def astar(G, s, t, landmarks=None):
+	"""Find a shortest path from s to t with A* search.  Vertices are taken from the
+	priority queue in order of distance from s plus a lower bound on the distance to t.
+	The ALT lower bounds are consistent, so a vertex is final once it is extracted.
+
+	Arguments:
+	G -- a weighted graph
+	s -- index of the source vertex
+	t -- index of the target vertex
+	landmarks -- a Landmarks object for G.  If None, the lower bound is 0 and the
+	search is Dijkstra's algorithm with early exit.
+	Assumption:
+	All weights are nonnegative
+
+	Returns:
+	path -- list of vertex indices from s to t, or [] if t is unreachable
+	cost -- weight of the path, or infinity if t is unreachable
+	"""
+	card_V = G.get_card_V()
+	d = [float('inf')] * card_V
+	pi = [None] * card_V
+	finished = [False] * card_V
+	d[s] = 0
+
+	# Compute each vertex's lower bound once, when it is first reached.
+	h = [None] * card_V
+	h[s] = landmarks.lower_bound(s, t) if landmarks is not None else 0
+
+	heap = [(h[s], s)]
+	while heap:
+		f_u, u = heappop(heap)
+		if finished[u]:  # stale entry?
+			continue
+		finished[u] = True
+		if u == t:
+			break
+
+		for edge in G.get_adj_list(u):
+			v = edge.get_v()
+			d_v = d[u] + edge.get_weight()
+			if d_v < d[v]:
+				d[v] = d_v
+				pi[v] = u
+				if h[v] is None:
+					h[v] = landmarks.lower_bound(v, t) if landmarks is not None else 0
+				heappush(heap, (d_v + h[v], v))
+
+	if d[t] == float('inf'):
+		return [], float('inf')
+	path = []
+	v = t
+	while v is not None:
+		path.append(v)
+		v = pi[v]
+	path.reverse()
+	return path, d[t]
+
+
+# Testing
+if __name__ == "__main__":
+
+	import os
+	import random
+	import tempfile
+	from adjacency_list_graph import AdjacencyListGraph
+
+	# Textbook example from dijkstra.py, which is directed.
+	vertices = ['s', 't', 'x', 'y', 'z']
+	edges = [('s', 't', 10), ('s', 'y', 5), ('t', 'x', 1), ('t', 'y', 2), ('x', 'z', 4),
+			('y', 't', 3), ('y', 'x', 9), ('y', 'z', 2), ('z', 's', 7), ('z', 'x', 6)]
+	graph1 = AdjacencyListGraph(len(vertices), True, True)
+	for edge in edges:
+		graph1.insert_edge(vertices.index(edge[0]), vertices.index(edge[1]), edge[2])
+	landmarks1 = preprocess_landmarks(graph1, 2)
+	path, cost = astar(graph1, vertices.index('s'), vertices.index('x'), landmarks1)
+	print([vertices[i] for i in path], cost)
+
+	# Random undirected graph: costs must agree with Dijkstra's algorithm.
+	random.seed(1828)
+	card_V = 200
+	graph2 = AdjacencyListGraph(card_V, False, True)
+	for u in range(card_V):
+		for v in range(u + 1, card_V):
+			if random.random() < 0.02:
+				graph2.insert_edge(u, v, random.randint(1, 10))
+	landmarks2 = preprocess_landmarks(graph2, 6)
+	print("Landmarks:", landmarks2.get_landmarks())
+
+	# Saving and loading gives the same tables.
+	file_path = os.path.join(tempfile.mkdtemp(), "landmarks.npz")
+	landmarks2.save(file_path)
+	landmarks3 = Landmarks.load(file_path)
+	print(np.array_equal(landmarks2.distances_from, landmarks3.distances_from))
+
+	all_equal = True
+	for s in range(0, card_V, 11):
+		d, pi = dijkstra_lazy(graph2, s)
+		for t in range(card_V):
+			path, cost = astar(graph2, s, t, landmarks3)
+			if cost != d[t] or (path and (path[0] != s or path[-1] != t)):
+				all_equal = False
+	print("All A* distances are " + ("not " if not all_equal else "") + "equal")
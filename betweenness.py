@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# betweenness.py
+
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dijkstra import dijkstra_lazy
+from bfs import bfs
+
+# The graph and engine of a worker process, set once by init_betweenness_worker
+worker_state = {}
+
+
+def init_betweenness_worker(G, engine):
+	"""Store the graph and engine in a worker process, so that they are sent only once."""
+	worker_state['G'] = G
+	worker_state['engine'] = engine
+
+
+def single_source_dependencies(G, s, engine, vertex_scores, edge_scores):
+	"""Add the dependencies of source s to the vertex and edge scores, as in Brandes'
+	algorithm.  The distances come from engine; the shortest-path DAG is then every edge
+	(v, w) with d[v] + w(v, w) = d[w].  Taking vertices in order of distance, each
+	vertex's number of shortest paths sigma is final before it is passed on, and taking
+	them in the reverse order accumulates the dependencies.
+
+	Arguments:
+	G -- the graph
+	s -- index of the source vertex
+	engine -- bfs, for which every edge counts 1, or a Dijkstra variant such as dijkstra_lazy
+	vertex_scores -- list of per-vertex scores, updated in place
+	edge_scores -- dictionary of per-edge scores keyed by (v, w), updated in place
+	Assumption:
+	All weights are positive
+	"""
+	card_V = G.get_card_V()
+	d, pi = engine(G, s)
+	unit_weights = engine == bfs or not G.is_weighted()
+	order = sorted((v for v in range(card_V) if d[v] != float('inf')), key=d.__getitem__)
+
+	sigma = [0] * card_V
+	sigma[s] = 1
+	predecessors = [[] for v in range(card_V)]
+	for v in order:
+		for edge in G.get_adj_list(v):
+			w = edge.get_v()
+			if d[v] + (1 if unit_weights else edge.get_weight()) == d[w]:
+				sigma[w] += sigma[v]
+				predecessors[w].append(v)
+
+	delta = [0.0] * card_V
+	for w in reversed(order):
+		for v in predecessors[w]:
+			c = sigma[v] / sigma[w] * (1 + delta[w])
+			edge_scores[(v, w)] = edge_scores.get((v, w), 0.0) + c
+			delta[v] += c
+		if w != s:
+			vertex_scores[w] += delta[w]
+
+
+def dependencies_from_sources(sources, G=None, engine=None):
+	"""Return the vertex and edge scores summed over the given sources.  Inside a worker
+	process, G and engine default to those stored by init_betweenness_worker."""
+	G = G if G is not None else worker_state['G']
+	engine = engine if engine is not None else worker_state['engine']
+	vertex_scores = [0.0] * G.get_card_V()
+	edge_scores = {}
+	for s in sources:
+		single_source_dependencies(G, s, engine, vertex_scores, edge_scores)
+	return vertex_scores, edge_scores
+
+
+def betweenness(G, engine=dijkstra_lazy, samples=None, seed=None, workers=None, normalized=False):
+	"""Compute the betweenness centrality of every vertex and edge with Brandes'
+	algorithm, running one single-source search per source.
+
+	Arguments:
+	G -- the graph
+	engine -- bfs to count stops, or dijkstra_lazy or dijkstra for weighted paths
+	samples -- if given, use only this many sources chosen at random and scale the
+	scores up by card_V / samples, which estimates the exact scores
+	seed -- seed for choosing the sample of sources
+	workers -- if given, split the sources across this many worker processes
+	normalized -- if True, divide by the number of ordered pairs of other vertices,
+	so that scores lie between 0 and 1
+	Assumption:
+	All weights are positive
+
+	Returns:
+	vertex_scores -- vertex_scores[v] is the betweenness of v
+	edge_scores -- dictionary mapping each edge (u, v) that is on some shortest path to
+	its betweenness, with u < v if G is undirected
+	"""
+	card_V = G.get_card_V()
+	sources = list(range(card_V))
+	if samples is not None and samples < card_V:
+		sources = random.Random(seed).sample(sources, samples)
+
+	if workers is None:
+		vertex_scores, edge_scores = dependencies_from_sources(sources, G, engine)
+	else:
+		# Each worker receives the graph once through the initializer, then handles a few batches.
+		batch_size = max(1, -(-len(sources) // (workers * 4)))
+		batches = [sources[i:i + batch_size] for i in range(0, len(sources), batch_size)]
+		vertex_scores = [0.0] * card_V
+		edge_scores = {}
+		with ProcessPoolExecutor(max_workers=workers, initializer=init_betweenness_worker,
+								 initargs=(G, engine)) as executor:
+			for batch_vertex_scores, batch_edge_scores in executor.map(dependencies_from_sources, batches):
+				for v in range(card_V):
+					vertex_scores[v] += batch_vertex_scores[v]
+				for edge, score in batch_edge_scores.items():
+					edge_scores[edge] = edge_scores.get(edge, 0.0) + score
+
+	# Each unordered pair of an undirected graph was counted from both ends.
+	scale = card_V / len(sources) if sources else 0.0
+	if not G.is_directed():
+		scale /= 2
+		undirected_scores = {}
+		for (u, v), score in edge_scores.items():
+			edge = (u, v) if u < v else (v, u)
+			undirected_scores[edge] = undirected_scores.get(edge, 0.0) + score
+		edge_scores = undirected_scores
+	if normalized and card_V > 2:
+		pairs = (card_V - 1) * (card_V - 2) / (1 if G.is_directed() else 2)
+		scale /= pairs
+	vertex_scores = [score * scale for score in vertex_scores]
+	edge_scores = {edge: score * scale for edge, score in edge_scores.items()}
+	return vertex_scores, edge_scores
+
+
+# Testing
+if __name__ == "__main__":
+
+	from adjacency_list_graph import AdjacencyListGraph
+
+	# A path a - b - c with a shortcut a - c of the same weight as the path.
+	graph1 = AdjacencyListGraph(3, False, True)
+	graph1.insert_edge(0, 1, 1)
+	graph1.insert_edge(1, 2, 1)
+	graph1.insert_edge(0, 2, 2)
+	print(betweenness(graph1))
+
+	# Random graphs: compare with counting every shortest path explicitly.
+	def all_shortest_paths(G, s, t, d):
+		if s == t:
+			return [[s]]
+		paths = []
+		for v in range(G.get_card_V()):
+			edge = G.find_edge(v, t)
+			if edge is not None and d[v] + edge.get_weight() == d[t]:
+				paths += [path + [t] for path in all_shortest_paths(G, s, v, d)]
+		return paths
+
+	random.seed(1828)
+	all_equal = True
+	for directed in [False, True]:
+		card_V = 14
+		graph2 = AdjacencyListGraph(card_V, directed, True)
+		for u in range(card_V):
+			for v in range(card_V):
+				if (directed or u < v) and u != v and random.random() < 0.25:
+					graph2.insert_edge(u, v, random.randint(1, 3))
+		expected_vertex = [0.0] * card_V
+		expected_edge = {}
+		for s in range(card_V):
+			d, pi = dijkstra_lazy(graph2, s)
+			for t in range(card_V):
+				if t == s or d[t] == float('inf') or (not directed and t < s):
+					continue
+				paths = all_shortest_paths(graph2, s, t, d)
+				for path in paths:
+					for v in path[1:-1]:
+						expected_vertex[v] += 1 / len(paths)
+					for i in range(len(path) - 1):
+						edge = (path[i], path[i + 1]) if directed else tuple(sorted(path[i:i + 2]))
+						expected_edge[edge] = expected_edge.get(edge, 0) + 1 / len(paths)
+		vertex_scores, edge_scores = betweenness(graph2)
+		parallel_vertex_scores, parallel_edge_scores = betweenness(graph2, workers=2)
+		for v in range(card_V):
+			if abs(vertex_scores[v] - expected_vertex[v]) > 1e-9 or abs(parallel_vertex_scores[v] - vertex_scores[v]) > 1e-9:
+				all_equal = False
+		for edge in set(expected_edge) | set(edge_scores):
+			if abs(edge_scores.get(edge, 0) - expected_edge.get(edge, 0)) > 1e-9:
+				all_equal = False
+		sampled_vertex_scores, sampled_edge_scores = betweenness(graph2, samples=card_V // 2, seed=1)
+		print("Sampled estimate of the most central vertex:", max(range(card_V), key=sampled_vertex_scores.__getitem__),
+			  "exact:", max(range(card_V), key=vertex_scores.__getitem__))
+	print("All betweenness scores are " + ("not " if not all_equal else "") + "equal")
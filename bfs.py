@@ -32,19 +32,24 @@
 
 from fifo_queue import Queue
 from adjacency_list_graph import AdjacencyListGraph
-from print_path import print_path
+from csr_graph import CSRGraph
+from print_path import print_path, print_paths
 
 WHITE = 0  # undiscovered
 GRAY = 1   # discovered
 BLACK = 2  # visited
 
 
-def bfs(G, source):
+def bfs(G, source, target=None):
 	"""Perform breadth-first search on a graph, filling in distances and predecessors.
 
 	Arguments:
 	G -- the graph, implemented with adjacency lists
 	source -- index of the source vertex
+	target -- optional index of a target vertex.  If given, stop as soon as the target
+	is discovered; dist and pi are then filled in only for vertices discovered so far.
+	On a CSRGraph, the rows of its arrays are walked directly, without building an edge
+	object per neighbor.
 	"""
 	# Initialize all vertices to white with distance of infinity and no predecessor, except source is gray.
 	card_V = G.get_card_V()  # vertices are numbered, so that color[i] gives the color of vertex i
@@ -53,6 +58,27 @@ def bfs(G, source):
 	pi = [None] * card_V
 	color[source] = GRAY
 	dist[source] = 0
+	if source == target:
+		return dist, pi
+
+	if isinstance(G, CSRGraph):
+		# The queue is a plain list of discovered vertices.  Looping over it while appending
+		# to it visits the vertices in first-in, first-out order.
+		offsets, neighbors = G.get_arrays()[:2]
+		queue = [source]
+		for u in queue:
+			d_v = dist[u] + 1
+			for i in range(offsets[u], offsets[u + 1]):
+				v = neighbors[i]
+				if color[v] == WHITE:
+					color[v] = GRAY
+					dist[v] = d_v
+					pi[v] = u
+					if v == target:
+						return dist, pi
+					queue.append(v)
+			color[u] = BLACK
+		return dist, pi
 
 	q = Queue(card_V)
 	q.enqueue(source)
@@ -64,6 +90,8 @@ def bfs(G, source):
 				color[v] = GRAY 
 				dist[v] = dist[u] + 1 	# add 1 to distance for v
 				pi[v] = u 	# assign predecessor
+				if v == target:  # a vertex's distance is final once it is discovered
+					return dist, pi
 				q.enqueue(v)  # v is now on the frontier
 		color[u] = BLACK  # u is now behind the frontier
 	return dist, pi
@@ -81,9 +109,9 @@ if __name__ == "__main__":
 	print(graph1)
 	s = 5
 	dist, predecessor = bfs(graph1, s)
+	paths = print_paths(predecessor, s, range(card_V), lambda i: i)  # all paths in one walk
 	for i in range(card_V):
-		print(str(i) + ": dist = " + str(dist[i]) + ", path = " +
-				str(print_path(predecessor, s, i, lambda i: i)))
+		print(str(i) + ": dist = " + str(dist[i]) + ", path = " + str(paths[i]))
 	print()
 
 	# Undirected, textbook example.
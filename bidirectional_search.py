@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# bidirectional_search.py
+
+from heapq import heappush, heappop
+
+
+def join_paths(pi_forward, pi_backward, meet):
+	"""Return the path through meeting vertex meet as a list of vertices.
+
+	Arguments:
+	pi_forward -- predecessors from the forward search, leading back to the source
+	pi_backward -- predecessors from the backward search, leading on to the target
+	meet -- the vertex where the two searches met
+	"""
+	path = []
+	v = meet
+	while v is not None:  # walk back to the source
+		path.append(v)
+		v = pi_forward[v]
+	path.reverse()
+	v = pi_backward[meet]
+	while v is not None:  # walk on to the target
+		path.append(v)
+		v = pi_backward[v]
+	return path
+
+
+def bidirectional_dijkstra(G, s, t, G_reverse=None):
+	"""Find a shortest path from s to t by running Dijkstra's algorithm from both ends.
+	The searches alternate, each settling one vertex at a time, and stop once the
+	sum of the two smallest tentative distances is no less than the best path found.
+
+	Arguments:
+	G -- a weighted graph
+	s -- index of the source vertex
+	t -- index of the target vertex
+	G_reverse -- the transpose of G, which the backward search follows.  Not needed
+	for an undirected graph.  For a directed graph it is computed if omitted.
+	Assumption:
+	All weights are nonnegative
+
+	Returns:
+	path -- list of vertex indices from s to t, or [] if t is unreachable
+	cost -- weight of the path, or infinity if t is unreachable
+	"""
+	if s == t:
+		return [s], 0
+	if G_reverse is None:
+		G_reverse = G.transpose() if G.is_directed() else G
+
+	card_V = G.get_card_V()
+	graphs = (G, G_reverse)
+	d = ([float('inf')] * card_V, [float('inf')] * card_V)
+	pi = ([None] * card_V, [None] * card_V)
+	finished = ([False] * card_V, [False] * card_V)
+	heaps = ([(0, s)], [(0, t)])
+	d[0][s] = 0
+	d[1][t] = 0
+
+	best = float('inf')  # weight of the best s-t path found so far
+	meet = None
+	while heaps[0] and heaps[1]:
+		# Stop once no path through an unsettled vertex can beat the best one.
+		if heaps[0][0][0] + heaps[1][0][0] >= best:
+			break
+
+		# Advance the search whose next vertex is closer to its end.
+		side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+		d_side, pi_side, finished_side = d[side], pi[side], finished[side]
+		d_other = d[1 - side]
+		heap = heaps[side]
+
+		d_u, u = heappop(heap)
+		if finished_side[u]:  # stale entry?
+			continue
+		finished_side[u] = True
+
+		for edge in graphs[side].get_adj_list(u):
+			v = edge.get_v()
+			d_v = d_u + edge.get_weight()
+			if d_v < d_side[v]:
+				d_side[v] = d_v
+				pi_side[v] = u
+				heappush(heap, (d_v, v))
+			# Does the edge join the two search trees more cheaply?
+			if d_side[v] + d_other[v] < best:
+				best = d_side[v] + d_other[v]
+				meet = v
+
+	if meet is None:
+		return [], float('inf')
+	return join_paths(pi[0], pi[1], meet), best
+
+
+def bidirectional_bfs(G, s, t, G_reverse=None):
+	"""Find a path from s to t with the fewest edges by running breadth-first search
+	from both ends.  Each step expands one whole level of the side with the smaller
+	frontier, so that the first level on which the searches meet gives a shortest path.
+
+	Arguments:
+	G -- the graph, implemented with adjacency lists
+	s -- index of the source vertex
+	t -- index of the target vertex
+	G_reverse -- the transpose of G, as in bidirectional_dijkstra
+
+	Returns:
+	path -- list of vertex indices from s to t, or [] if t is unreachable
+	cost -- number of edges on the path, or infinity if t is unreachable
+	"""
+	if s == t:
+		return [s], 0
+	if G_reverse is None:
+		G_reverse = G.transpose() if G.is_directed() else G
+
+	card_V = G.get_card_V()
+	graphs = (G, G_reverse)
+	dist = ([float('inf')] * card_V, [float('inf')] * card_V)
+	pi = ([None] * card_V, [None] * card_V)
+	frontiers = ([s], [t])
+	dist[0][s] = 0
+	dist[1][t] = 0
+
+	while frontiers[0] and frontiers[1]:
+		side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+		dist_side, pi_side = dist[side], pi[side]
+		dist_other = dist[1 - side]
+
+		# Expand the whole level, remembering the best edge into the other tree.
+		best = float('inf')
+		meet = None
+		next_frontier = []
+		for u in frontiers[side]:
+			for edge in graphs[side].get_adj_list(u):
+				v = edge.get_v()
+				if dist_side[v] == float('inf'):  # is v being discovered now?
+					dist_side[v] = dist_side[u] + 1
+					pi_side[v] = u
+					next_frontier.append(v)
+				if dist_other[v] != float('inf') and dist_side[u] + 1 + dist_other[v] < best:
+					best = dist_side[u] + 1 + dist_other[v]
+					meet = (u, v)
+		if meet is not None:
+			u, v = meet
+			pi_side[v] = u  # route the path through the meeting edge
+			return join_paths(pi[0], pi[1], v), best
+		frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+
+	return [], float('inf')
+
+
+# Testing
+if __name__ == "__main__":
+
+	import random
+	from adjacency_list_graph import AdjacencyListGraph
+	from dijkstra import dijkstra
+	from bfs import bfs
+
+	# Textbook example from dijkstra.py, which is directed.
+	vertices = ['s', 't', 'x', 'y', 'z']
+	edges = [('s', 't', 10), ('s', 'y', 5), ('t', 'x', 1), ('t', 'y', 2), ('x', 'z', 4),
+			('y', 't', 3), ('y', 'x', 9), ('y', 'z', 2), ('z', 's', 7), ('z', 'x', 6)]
+	graph1 = AdjacencyListGraph(len(vertices), True, True)
+	for edge in edges:
+		graph1.insert_edge(vertices.index(edge[0]), vertices.index(edge[1]), edge[2])
+	path, cost = bidirectional_dijkstra(graph1, vertices.index('s'), vertices.index('x'))
+	print([vertices[i] for i in path], cost)
+
+	# Random undirected graphs: costs must agree with the one-directional searches.
+	random.seed(1828)
+	all_equal = True
+	for trial in range(20):
+		card_V = 60
+		graph2 = AdjacencyListGraph(card_V, False, True)
+		for u in range(card_V):
+			for v in range(u + 1, card_V):
+				if random.random() < 0.05:
+					graph2.insert_edge(u, v, random.randint(1, 10))
+		for s in range(0, card_V, 7):
+			d, pi = dijkstra(graph2, s)
+			dist, pi = bfs(graph2, s)
+			for t in range(card_V):
+				path, cost = bidirectional_dijkstra(graph2, s, t)
+				hops, stops = bidirectional_bfs(graph2, s, t)
+				if cost != d[t] or stops != dist[t]:
+					all_equal = False
+				# The path must use edges of the graph and have the reported weight.
+				if path and sum(graph2.find_edge(path[i], path[i + 1]).get_weight()
+								for i in range(len(path) - 1)) != cost:
+					all_equal = False
+				if hops and (len(hops) - 1 != stops or hops[0] != s or hops[-1] != t):
+					all_equal = False
+	print("All bidirectional results are " + ("not " if not all_equal else "") + "equal")
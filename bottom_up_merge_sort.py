@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# bottom_up_merge_sort.py
+
+import numpy as np
+
+
+def find_runs(keys):
+	"""Return the boundaries of the natural runs of keys: a list b = [0, ..., len(keys)]
+	such that each keys[b[i]:b[i+1]] is nondecreasing.  A strictly decreasing stretch is
+	also a run, and is reversed in place; it has no equal keys, so reversing it keeps
+	the sort stable.  Only <= is used to compare keys.
+
+	Arguments:
+	keys -- list of keys, reversed in place where runs are decreasing
+	"""
+	n = len(keys)
+	bounds = [0]
+	i = 0
+	while i < n:
+		j = i + 1
+		if j < n and not keys[i] <= keys[j]:  # strictly decreasing run
+			while j < n and not keys[j - 1] <= keys[j]:
+				j += 1
+			keys[i:j] = keys[i:j][::-1]
+		else:
+			while j < n and keys[j - 1] <= keys[j]:
+				j += 1
+		bounds.append(j)
+		i = j
+	return bounds
+
+
+def merge_into(src, dst, lo, mid, hi):
+	"""Merge the sorted runs src[lo:mid] and src[mid:hi] into dst[lo:hi], taking from
+	the left run on ties so that the merge is stable."""
+	if src[mid - 1] <= src[mid]:  # already in order: nothing to merge
+		dst[lo:hi] = src[lo:hi]
+		return
+	i, j, k = lo, mid, lo
+	while i < mid and j < hi:
+		if src[i] <= src[j]:
+			dst[k] = src[i]
+			i += 1
+		else:
+			dst[k] = src[j]
+			j += 1
+		k += 1
+	# Copy the rest of whichever run is left over.
+	if i < mid:
+		dst[k:hi] = src[i:mid]
+	else:
+		dst[k:hi] = src[j:hi]
+
+
+def bottom_up_merge_sort(A, key=None):
+	"""Sort A in place, stably, in nondecreasing order.  Unlike merge_sort, this does
+	not recurse or slice new left and right lists at every level.  It finds the natural
+	runs already in A, then merges neighbouring runs pass by pass between A and a single
+	scratch list of the same length, and an input that is already sorted takes one
+	linear scan.  Only <= is used to compare.
+
+	The peak extra space is O(n).  Leftover parts of runs are copied with slices, which
+	build short-lived lists, so the total allocated over the whole sort is O(n log n).
+
+	A NumPy array with no key is sorted in place by NumPy's stable sort, without
+	converting its elements to Python objects.
+
+	Arguments:
+	A -- a list or NumPy array
+	key -- optional function giving the key to sort each element by
+	"""
+	if isinstance(A, np.ndarray) and key is None:
+		A.sort(kind='stable')
+		return
+
+	# Sort a list of the elements, or of (key, index) pairs.  The index breaks ties between
+	# equal keys in their original order, so tuples can be compared directly.
+	if key is not None:
+		items = list(A)
+		src = [(key(x), i) for i, x in enumerate(items)]
+	elif type(A) is list:
+		src = A
+	else:
+		src = list(A)
+	n = len(src)
+	bounds = find_runs(src)
+	dst = [None] * n  # the one scratch list
+
+	# Each pass merges pairs of neighbouring runs from src into dst, then swaps them.
+	while len(bounds) > 2:
+		merged_bounds = [0]
+		for i in range(0, len(bounds) - 1, 2):
+			lo = bounds[i]
+			if i + 2 < len(bounds):
+				hi = bounds[i + 2]
+				merge_into(src, dst, lo, bounds[i + 1], hi)
+			else:  # an odd run out is copied across unchanged
+				hi = bounds[i + 1]
+				dst[lo:hi] = src[lo:hi]
+			merged_bounds.append(hi)
+		src, dst = dst, src
+		bounds = merged_bounds
+
+	# Put the result back into A, unless it is already there.
+	if key is not None:
+		A[:] = [items[i] for k, i in src]
+	elif src is not A:
+		A[:] = src
+
+
+# Testing
+if __name__ == "__main__":
+
+	import random
+
+	# Repeating terms, as in merge_sort.py.
+	list1 = [11, 1, 51, 1, 5, 3]
+	bottom_up_merge_sort(list1)
+	print(list1)
+
+	# Stability with a key: equal keys keep their order.
+	pairs = [(random.randint(0, 5), i) for i in range(200)]
+	pairs_test = sorted(pairs, key=lambda pair: pair[0])
+	bottom_up_merge_sort(pairs, key=lambda pair: pair[0])
+	print(pairs == pairs_test)
+
+	# Runs: sorted, reversed, and sawtooth inputs.
+	all_equal = True
+	for list2 in [list(range(1000)), list(range(1000, 0, -1)), [i % 37 for i in range(1000)],
+				  [random.random() for i in range(1000)], [], [7]]:
+		list2_test = sorted(list2)
+		bottom_up_merge_sort(list2)
+		if list2 != list2_test:
+			all_equal = False
+	print("All sorted lists are " + ("not " if not all_equal else "") + "equal")
+
+	# NumPy arrays are sorted in place, with and without a key.
+	array1 = np.random.randint(-5000, 5000, size=1000)
+	array1_test = np.sort(array1)
+	view = array1[:]
+	bottom_up_merge_sort(array1)
+	print(np.array_equal(array1, array1_test), np.shares_memory(view, array1))
+	array2 = np.array([3.5, -1.0, 2.0, -7.25])
+	bottom_up_merge_sort(array2, key=abs)
+	print(array2)
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# bridges.py
+
+
+class Biconnectivity:
+
+	def __init__(self, G):
+		"""Find the bridges, articulation points and biconnected components of an
+		undirected graph with Tarjan's depth-first search, in O(V + E) time.  The search
+		keeps an explicit stack of (vertex, adjacency-list iterator) pairs instead of
+		recursing, so long paths do not reach Python's recursion limit.
+
+		For each vertex u, disc[u] is its discovery time and low[u] is the earliest
+		discovery time reachable from the subtree of u by one back edge.  A tree edge
+		(p, u) is a bridge if low[u] > disc[p], and p separates the subtree of u from
+		the rest of the graph if low[u] >= disc[p].
+
+		Arguments:
+		G -- an undirected graph, such as an AdjacencyListGraph
+		"""
+		if G.is_directed():
+			raise RuntimeError("Graph should be undirected.")
+		card_V = G.get_card_V()
+		self.card_V = card_V
+		disc = [None] * card_V
+		low = [0] * card_V
+		parent = [None] * card_V
+		self.size = [1] * card_V  # size[u] is the number of vertices in the DFS subtree of u
+		self.component_size = [0] * card_V  # number of vertices in u's connected component
+		self.bridges = []
+		# pieces[p] lists the sizes of the parts that removing articulation point p leaves
+		# in p's connected component.
+		self.pieces = {}
+		self.components = []  # each a list of edges
+		edge_stack = []
+		time = 0
+
+		for root in range(card_V):
+			if disc[root] is not None:
+				continue
+			disc[root] = low[root] = time
+			time += 1
+			tree = [root]  # the vertices of this connected component
+			tree_pieces = {}  # pieces of the vertices in this component, found so far
+			stack = [(root, iter(G.get_adj_list(root)))]
+			while stack:
+				u, neighbors = stack[-1]
+				for edge in neighbors:
+					v = edge.get_v()
+					if disc[v] is None:  # tree edge: descend into v
+						parent[v] = u
+						disc[v] = low[v] = time
+						time += 1
+						tree.append(v)
+						edge_stack.append((u, v))
+						stack.append((v, iter(G.get_adj_list(v))))
+						break
+					if v != parent[u] and disc[v] < disc[u]:  # back edge to an ancestor
+						low[u] = min(low[u], disc[v])
+						edge_stack.append((u, v))
+				else:  # all of u's edges are done, so finish u
+					stack.pop()
+					p = parent[u]
+					if p is None:
+						continue
+					low[p] = min(low[p], low[u])
+					self.size[p] += self.size[u]
+					if low[u] > disc[p]:
+						self.bridges.append((p, u))
+					if low[u] >= disc[p]:
+						# The edges above (p, u) on the stack form one biconnected component.
+						component = []
+						while True:
+							e = edge_stack.pop()
+							component.append(e)
+							if e == (p, u):
+								break
+						self.components.append(component)
+						tree_pieces.setdefault(p, []).append(self.size[u])
+
+			for v in tree:
+				self.component_size[v] = len(tree)
+			# A non-root vertex also leaves the part holding its parent, if any; the root is
+			# an articulation point only if it has more than one child.
+			for p, pieces in tree_pieces.items():
+				rest = len(tree) - 1 - sum(pieces)
+				if rest > 0:
+					pieces.append(rest)
+				if len(pieces) > 1:
+					self.pieces[p] = pieces
+		self.bridge_set = set(self.bridges)
+
+	def get_bridges(self):
+		"""Return the bridges as a list of (u, v) pairs, with u the end nearer the DFS root."""
+		return self.bridges
+
+	def get_articulation_points(self):
+		"""Return the articulation points as a sorted list of vertices."""
+		return sorted(self.pieces)
+
+	def get_components(self):
+		"""Return the biconnected components, each as a list of edges (u, v)."""
+		return self.components
+
+	def is_bridge(self, u, v):
+		"""Return True if edge (u, v) is a bridge, False otherwise."""
+		return (u, v) in self.bridge_set or (v, u) in self.bridge_set
+
+	def bridge_split(self, u, v):
+		"""Return the sizes of the two parts that deleting bridge (u, v) leaves, with the
+		part holding u first."""
+		if (u, v) in self.bridge_set:
+			return self.component_size[u] - self.size[v], self.size[v]
+		if (v, u) in self.bridge_set:
+			return self.size[u], self.component_size[u] - self.size[u]
+		raise RuntimeError("Edge (" + str(u) + ", " + str(v) + ") is not a bridge.")
+
+	def articulation_pieces(self, v):
+		"""Return the sizes of the parts that deleting articulation point v leaves in its
+		connected component, or [] if v is not an articulation point."""
+		return self.pieces.get(v, [])
+
+
+def pairs_disconnected(part_sizes):
+	"""Return the number of unordered pairs of vertices that end up in different parts,
+	given the sizes of the parts."""
+	total = sum(part_sizes)
+	return (total * total - sum(size * size for size in part_sizes)) // 2
+
+
+# Testing
+if __name__ == "__main__":
+
+	import random
+	from adjacency_list_graph import AdjacencyListGraph
+	from bfs import bfs
+
+	# Two triangles joined through a path, with a pendant vertex.
+	edges = [(0, 1), (1, 2), (2, 0), (2, 3), (3, 4), (4, 5), (5, 6), (6, 4), (6, 7)]
+	graph1 = AdjacencyListGraph(9, False)
+	for u, v in edges:
+		graph1.insert_edge(u, v)
+	bc1 = Biconnectivity(graph1)
+	print("Bridges:", bc1.get_bridges())
+	print("Articulation points:", bc1.get_articulation_points())
+	print("Components:", bc1.get_components())
+	print(bc1.bridge_split(2, 3), bc1.articulation_pieces(4))
+
+	# Random sparse graphs: compare with deleting each edge and vertex and searching again.
+	def card_reachable_pairs(G, deleted):
+		pairs = 0
+		for s in range(G.get_card_V()):
+			if s != deleted:
+				dist, pi = bfs(G, s)
+				pairs += sum(1 for t in range(G.get_card_V()) if t != s and t != deleted and dist[t] != float('inf'))
+		return pairs // 2
+
+	random.seed(1828)
+	all_equal = True
+	for trial in range(30):
+		card_V = 25
+		graph2 = AdjacencyListGraph(card_V, False)
+		for u in range(card_V):
+			for v in range(u + 1, card_V):
+				if random.random() < 0.09:
+					graph2.insert_edge(u, v)
+		bc2 = Biconnectivity(graph2)
+		for u, v in graph2.get_edge_list():
+			before = card_reachable_pairs(graph2, None)
+			graph2.delete_edge(u, v)
+			lost = before - card_reachable_pairs(graph2, None)
+			graph2.insert_edge(u, v)
+			expected = pairs_disconnected(bc2.bridge_split(u, v)) if bc2.is_bridge(u, v) else 0
+			if lost != expected:
+				all_equal = False
+		for v in range(card_V):
+			# Deleting v's edges leaves v isolated; count pairs among the other vertices.
+			neighbors = [edge.get_v() for edge in graph2.get_adj_list(v)]
+			others_before = card_reachable_pairs(graph2, None) - sum(1 for t in range(card_V)
+					if t != v and bfs(graph2, v)[0][t] != float('inf'))
+			for w in neighbors:
+				graph2.delete_edge(v, w)
+			lost = others_before - card_reachable_pairs(graph2, v)
+			for w in neighbors:
+				graph2.insert_edge(v, w)
+			if lost != pairs_disconnected(bc2.articulation_pieces(v)):
+				all_equal = False
+		# Every edge is in exactly one biconnected component.
+		if sorted(tuple(sorted(e)) for c in bc2.get_components() for e in c) != sorted(graph2.get_edge_list()):
+			all_equal = False
+	print("All bridge and articulation results are " + ("not " if not all_equal else "") + "equal")
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# contraction_hierarchies.py
+
+from heapq import heappush, heappop
+
+
+class ContractionHierarchy:
+
+	def __init__(self, card_V, edges, witness_settle_limit=500):
+		"""Preprocess an undirected, weighted graph into a contraction hierarchy.
+		Vertices are contracted one at a time, cheapest first.  Contracting v adds a
+		shortcut between two of its remaining neighbors u and w, with weight
+		w(u, v) + w(v, w), unless a witness search finds a path from u to w that
+		avoids v and is no longer.  A query then only ever moves to higher-ranked vertices.
+
+		Arguments:
+		card_V -- number of vertices
+		edges -- iterable of (u, v, weight) triples; for parallel edges the lightest is kept
+		witness_settle_limit -- maximum number of vertices a witness search may settle
+		before giving up and adding the shortcut anyway
+		"""
+		self.card_V = card_V
+		self.witness_settle_limit = witness_settle_limit
+
+		# adj[v] maps each remaining neighbor of v to the weight of the edge between them.
+		self.adj = [{} for v in range(card_V)]
+		for u, v, weight in edges:
+			if u == v:
+				raise RuntimeError("Cannot insert self-loop (" + str(u) + ", " + str(v) + ") into undirected graph")
+			if v not in self.adj[u] or weight < self.adj[u][v]:
+				self.adj[u][v] = weight
+				self.adj[v][u] = weight
+
+		# middle[(u, w)] is the contracted vertex that a shortcut (u, w) bypasses.
+		self.middle = {}
+		self.rank = [None] * card_V  # order in which vertices were contracted
+		self.up = [None] * card_V  # up[v] maps higher-ranked neighbors to edge weights
+		self.card_shortcuts = 0
+
+		self.contract_all()
+		self.adj = None  # the working graph is no longer needed
+
+	@staticmethod
+	def from_edges_dict(station_map, edges_dict, weight_type):
+		"""Build a contraction hierarchy from the station map and edge dictionary
+		produced by functions.prepare_data, weighted by 'time' or 'stops'."""
+		edges = ((u, v, weights[weight_type]) for (u, v), weights in edges_dict.items())
+		return ContractionHierarchy(len(station_map), edges)
+
+	@staticmethod
+	def from_graph(G):
+		"""Build a contraction hierarchy from an undirected, weighted graph."""
+		if G.is_directed():
+			raise RuntimeError("Graph should be undirected.")
+		edges = []
+		for u in range(G.get_card_V()):
+			for edge in G.get_adj_list(u):
+				if u < edge.get_v():
+					edges.append((u, edge.get_v(), edge.get_weight()))
+		return ContractionHierarchy(G.get_card_V(), edges)
+
+	def get_card_V(self):
+		"""Return the number of vertices."""
+		return self.card_V
+
+	def get_card_shortcuts(self):
+		"""Return the number of shortcuts added during preprocessing."""
+		return self.card_shortcuts
+
+	def get_rank(self, v):
+		"""Return the position of vertex v in the contraction order."""
+		return self.rank[v]
+
+	def witness_distance(self, u, target, excluded, limit):
+		"""Return the distance from u to target in the remaining graph without vertex excluded,
+		or infinity if it exceeds limit or the search settles too many vertices."""
+		d = {u: 0}
+		heap = [(0, u)]
+		settled = 0
+		while heap:
+			d_x, x = heappop(heap)
+			if d_x > d[x]:  # stale entry?
+				continue
+			if x == target:
+				return d_x
+			if d_x > limit or settled >= self.witness_settle_limit:
+				break
+			settled += 1
+			for y, weight in self.adj[x].items():
+				if y != excluded and d_x + weight < d.get(y, float('inf')):
+					d[y] = d_x + weight
+					heappush(heap, (d[y], y))
+		return float('inf')
+
+	def shortcuts_for(self, v):
+		"""Return the shortcuts (u, w, weight) that contracting v would need."""
+		shortcuts = []
+		neighbors = list(self.adj[v].items())
+		for i in range(len(neighbors)):
+			u, weight_u = neighbors[i]
+			for j in range(i + 1, len(neighbors)):
+				w, weight_w = neighbors[j]
+				via_v = weight_u + weight_w
+				if self.witness_distance(u, w, v, via_v) > via_v:
+					shortcuts.append((u, w, via_v))
+		return shortcuts
+
+	def priority(self, v, contracted_neighbors):
+		"""Return the contraction priority of v: its edge difference plus the number of
+		neighbors already contracted, which spreads contractions over the graph."""
+		return len(self.shortcuts_for(v)) - len(self.adj[v]) + contracted_neighbors[v]
+
+	def contract_all(self):
+		"""Contract every vertex, choosing the order with lazily updated priorities."""
+		contracted_neighbors = [0] * self.card_V
+		heap = [(self.priority(v, contracted_neighbors), v) for v in range(self.card_V)]
+		heap.sort()
+		order = 0
+		while heap:
+			p, v = heappop(heap)
+			# Priorities go stale as neighbors are contracted, so check before contracting.
+			p = self.priority(v, contracted_neighbors)
+			if heap and p > heap[0][0]:
+				heappush(heap, (p, v))
+				continue
+
+			for u, w, weight in self.shortcuts_for(v):
+				if weight < self.adj[u].get(w, float('inf')):
+					self.adj[u][w] = weight
+					self.adj[w][u] = weight
+					self.middle[(u, w)] = v
+					self.middle[(w, u)] = v
+					self.card_shortcuts += 1
+
+			# All of v's remaining neighbors will be contracted later, so they rank higher.
+			self.rank[v] = order
+			order += 1
+			self.up[v] = self.adj[v]
+			for u in self.adj[v]:
+				del self.adj[u][v]
+				contracted_neighbors[u] += 1
+
+	def upward_search(self, d, pi, heap, other_d, best, meet):
+		"""Settle the next vertex of one side of the query.  Return the updated best
+		distance and meeting vertex."""
+		d_u, u = heappop(heap)
+		if d_u > d[u]:  # stale entry?
+			return best, meet
+		if u in other_d and d_u + other_d[u] < best:
+			best = d_u + other_d[u]
+			meet = u
+		for v, weight in self.up[u].items():
+			if d_u + weight < d.get(v, float('inf')):
+				d[v] = d_u + weight
+				pi[v] = u
+				heappush(heap, (d[v], v))
+		return best, meet
+
+	def query(self, s, t):
+		"""Find a shortest path from s to t.
+
+		Returns:
+		path -- list of vertex indices from s to t, or [] if t is unreachable
+		cost -- weight of the path, or infinity if t is unreachable
+		"""
+		if s == t:
+			return [s], 0
+		d_forward, d_backward = {s: 0}, {t: 0}
+		pi_forward, pi_backward = {s: None}, {t: None}
+		heap_forward, heap_backward = [(0, s)], [(0, t)]
+		best = float('inf')
+		meet = None
+
+		# Both searches go upward only; a side is done once its smallest key reaches best.
+		while (heap_forward and heap_forward[0][0] < best) or (heap_backward and heap_backward[0][0] < best):
+			if heap_forward and heap_forward[0][0] < best:
+				best, meet = self.upward_search(d_forward, pi_forward, heap_forward, d_backward, best, meet)
+			if heap_backward and heap_backward[0][0] < best:
+				best, meet = self.upward_search(d_backward, pi_backward, heap_backward, d_forward, best, meet)
+
+		if meet is None:
+			return [], float('inf')
+
+		# Collect the path in the hierarchy, then unpack its shortcuts.
+		hierarchy_path = []
+		v = meet
+		while v is not None:
+			hierarchy_path.append(v)
+			v = pi_forward[v]
+		hierarchy_path.reverse()
+		v = pi_backward[meet]
+		while v is not None:
+			hierarchy_path.append(v)
+			v = pi_backward[v]
+		return self.unpack_path(hierarchy_path), best
+
+	def unpack_path(self, hierarchy_path):
+		"""Replace each shortcut on a path by the original edges it stands for."""
+		path = [hierarchy_path[0]]
+		for i in range(len(hierarchy_path) - 1):
+			# Expand the edge with an explicit stack, left part on top.
+			stack = [(hierarchy_path[i], hierarchy_path[i + 1])]
+			while stack:
+				u, w = stack.pop()
+				v = self.middle.get((u, w))
+				if v is None:  # an original edge
+					path.append(w)
+				else:
+					stack.append((v, w))
+					stack.append((u, v))
+		return path
+
+
+def ch_query(ch, s, t):
+	"""Find a shortest path from s to t in a ContractionHierarchy, returning (path, cost)
+	like the other point-to-point engines."""
+	return ch.query(s, t)
+
+
+# Testing
+if __name__ == "__main__":
+
+	import random
+	from adjacency_list_graph import AdjacencyListGraph
+	from dijkstra import dijkstra
+
+	# Example from mst.py.
+	vertices = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i']
+	edges = [('a', 'b', 4), ('a', 'h', 8), ('b', 'c', 8), ('b', 'h', 11), ('c', 'd', 7),
+			 ('c', 'f', 4), ('c', 'i', 2), ('d', 'e', 9), ('d', 'f', 14), ('e', 'f', 10),
+			 ('f', 'g', 2), ('g', 'h', 1), ('g', 'i', 6), ('h', 'i', 7)]
+	graph1 = AdjacencyListGraph(len(vertices), False, True)
+	for edge in edges:
+		graph1.insert_edge(vertices.index(edge[0]), vertices.index(edge[1]), edge[2])
+	ch1 = ContractionHierarchy.from_graph(graph1)
+	path, cost = ch1.query(vertices.index('a'), vertices.index('e'))
+	print([vertices[i] for i in path], cost)
+
+	# Random undirected graphs: results must agree with Dijkstra's algorithm.
+	random.seed(1828)
+	all_equal = True
+	for trial in range(10):
+		card_V = 80
+		graph2 = AdjacencyListGraph(card_V, False, True)
+		for u in range(card_V):
+			for v in range(u + 1, card_V):
+				if random.random() < 0.04:
+					graph2.insert_edge(u, v, random.randint(1, 10))
+		ch2 = ContractionHierarchy.from_graph(graph2)
+		for s in range(0, card_V, 9):
+			d, pi = dijkstra(graph2, s)
+			for t in range(card_V):
+				path, cost = ch2.query(s, t)
+				if cost != d[t]:
+					all_equal = False
+				# The unpacked path must use original edges and have the reported weight.
+				if path and (path[0] != s or path[-1] != t or sum(graph2.find_edge(path[i], path[i + 1]).get_weight()
+																  for i in range(len(path) - 1)) != cost):
+					all_equal = False
+	print("All contraction hierarchy distances are " + ("not " if not all_equal else "") + "equal")
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# csr_graph.py
+
+from array import array
+from itertools import repeat
+from numbers import Integral
+from operator import itemgetter
+from adjacency_matrix_graph import AdjacencyMatrixGraph
+
+
+class CSREdge(tuple):
+
+	__slots__ = ()
+
+	# An edge is a (v, weight) tuple, so that a whole adjacency list can be built
+	# by map() without running Python code per edge.
+	v = property(itemgetter(0), doc="the other vertex that the edge is incident on")
+	weight = property(itemgetter(1), doc="weight of the edge, None for unweighted graphs")
+
+	def get_v(self):
+		"""Return the vertex index."""
+		return self[0]
+
+	def get_weight(self):
+		"""Return the weight of this edge."""
+		return self[1]
+
+	def strmap(self, mapping_func):
+		"""String version of the vertex with optional weight in parentheses.
+		Vertex numbers are mapped according to a mapping function."""
+		string = str(mapping_func(self[0]))
+		if self[1] is not None:
+			string += " (" + str(self[1]) + ")"
+		return string
+
+	def __str__(self):
+		"""String version of the vertex with optional weight in parentheses."""
+		return self.strmap(lambda v: v)
+
+
+class CSRGraph:
+
+	def __init__(self, card_V, edges, directed=True, weighted=False):
+		"""Initialize a frozen graph stored in compressed sparse row form.
+		The adjacency list of vertex u occupies neighbors[offsets[u]: offsets[u+1]]
+		(and the same slice of weights), in the order the edges were given.
+
+		Arguments:
+		card_V -- number of vertices in this graph
+		edges -- iterable of (u, v) pairs, or (u, v, weight) triples for weighted graphs
+		directed -- boolean indicating whether the graph is directed
+		weighted -- boolean indicating whether edges are weighted
+		"""
+		self.directed = directed
+		self.weighted = weighted
+		self.card_V = card_V
+
+		# Collect the endpoints once, validating them like AdjacencyListGraph.insert_edge does.
+		tails = array('l')
+		heads = array('l')
+		edge_weights = []
+		seen = set()
+		for edge in edges:
+			u, v = int(edge[0]), int(edge[1])
+			weight = edge[2] if len(edge) > 2 else None
+			if weighted and weight is None:
+				raise RuntimeError("Inserting unweighted edge (" + str(u) + ", " + str(v) + ") in weighted graph.")
+			if not weighted and weight is not None:
+				raise RuntimeError("Inserting weighted edge (" + str(u) + ", " + str(v) + ") in unweighted graph.")
+			if not directed and u == v:
+				raise RuntimeError("Cannot insert self-loop (" + str(u) + ", " + str(v) + ") into undirected graph")
+			key = (u, v) if directed or u < v else (v, u)
+			if key in seen:
+				raise RuntimeError("An edge (" + str(u) + ", " + str(v) + ") already exists.")
+			seen.add(key)
+			tails.append(u)
+			heads.append(v)
+			edge_weights.append(weight)
+		self.card_E = len(tails)
+
+		# Integer weights (such as minutes or stops) are kept as integers so that distances
+		# come out with the same type as they do on an AdjacencyListGraph.
+		if weighted and all(isinstance(w, Integral) for w in edge_weights):
+			typecode = 'q'
+		else:
+			typecode = 'd'
+
+		# Count the out-degree of every vertex.  An undirected edge appears in both lists.
+		degree = [0] * (card_V + 1)
+		for i in range(self.card_E):
+			degree[tails[i] + 1] += 1
+			if not directed:
+				degree[heads[i] + 1] += 1
+		for u in range(card_V):
+			degree[u + 1] += degree[u]
+		self.offsets = array('q', degree)
+
+		# Scatter the edges into place, keeping insertion order within each list.
+		card_slots = self.offsets[card_V]
+		self.neighbors = array('i', bytes(4 * card_slots))
+		self.weights = array(typecode, bytes(8 * card_slots)) if weighted else None
+		fill = list(degree[:card_V])
+		for i in range(self.card_E):
+			u, v = tails[i], heads[i]
+			self.neighbors[fill[u]] = v
+			if weighted:
+				self.weights[fill[u]] = edge_weights[i]
+			fill[u] += 1
+			if not directed:
+				self.neighbors[fill[v]] = u
+				if weighted:
+					self.weights[fill[v]] = edge_weights[i]
+				fill[v] += 1
+
+	@staticmethod
+	def from_graph(G):
+		"""Return a CSRGraph holding the same edges as graph G, in the same adjacency order."""
+		edges = []
+		directed = G.is_directed()
+		weighted = G.is_weighted()
+		for u in range(G.get_card_V()):
+			for edge in G.get_adj_list(u):
+				v = edge.get_v()
+				if directed or u < v:
+					edges.append((u, v, edge.get_weight()) if weighted else (u, v))
+		return CSRGraph(G.get_card_V(), edges, directed, weighted)
+
+	def get_card_V(self):
+		"""Return the number of vertices in this graph."""
+		return self.card_V
+
+	def get_card_E(self):
+		"""Return the number of edges in this graph."""
+		return self.card_E
+
+	def is_directed(self):
+		"""Return a boolean indicating whether this graph is directed."""
+		return self.directed
+
+	def is_weighted(self):
+		"""Return a boolean indicating whether this graph is weighted."""
+		return self.weighted
+
+	def get_version(self):
+		"""Return the edge-change counter.  A frozen graph never changes, so it is always 0."""
+		return 0
+
+	def get_neighbors(self, u):
+		"""Return the neighbors of vertex u and the matching weights as two array slices.
+		The weights slice is None for an unweighted graph."""
+		lo, hi = self.offsets[u], self.offsets[u + 1]
+		if self.weighted:
+			return self.neighbors[lo:hi], self.weights[lo:hi]
+		return self.neighbors[lo:hi], None
+
+	def get_arrays(self):
+		"""Return the offsets, neighbors and weights arrays, for engines that walk the rows
+		directly instead of building an edge object per neighbor.  The weights array is
+		None for an unweighted graph."""
+		return self.offsets, self.neighbors, self.weights
+
+	def get_adj_list(self, u):
+		"""Return an iterator for the adjacency list of vertex u."""
+		lo, hi = self.offsets[u], self.offsets[u + 1]
+		if self.weighted:
+			return map(CSREdge, zip(self.neighbors[lo:hi], self.weights[lo:hi]))
+		return map(CSREdge, zip(self.neighbors[lo:hi], repeat(None)))
+
+	def find_edge(self, u, v):
+		"""Return the edge object for edge (u, v) if (u, v) is in this graph, None otherwise."""
+		for i in range(self.offsets[u], self.offsets[u + 1]):
+			if self.neighbors[i] == v:
+				return CSREdge((v, self.weights[i] if self.weighted else None))
+		return None
+
+	def has_edge(self, u, v):
+		"""Return True if edge (u, v) is in this graph, False otherwise."""
+		return self.find_edge(u, v) is not None
+
+	def insert_edge(self, u, v, weight=None):
+		"""A CSRGraph is frozen, so inserting an edge is an error."""
+		raise RuntimeError("Cannot insert edge (" + str(u) + ", " + str(v) + ") into a frozen CSR graph.")
+
+	def delete_edge(self, u, v, delete_undirected=True):
+		"""A CSRGraph is frozen, so deleting an edge is an error."""
+		raise RuntimeError("Cannot delete edge (" + str(u) + ", " + str(v) + ") from a frozen CSR graph.")
+
+	def set_weight(self, u, v, weight):
+		"""A CSRGraph is frozen, so changing a weight is an error."""
+		raise RuntimeError("Cannot set the weight of edge (" + str(u) + ", " + str(v) + ") in a frozen CSR graph.")
+
+	def copy(self):
+		"""Return this graph.  Since a CSRGraph never changes, it can be shared."""
+		return self
+
+	def get_edge_list(self):
+		"""Return a Python list containing the edges of this graph."""
+		edge_list = []
+		for u in range(self.card_V):
+			for i in range(self.offsets[u], self.offsets[u + 1]):
+				v = self.neighbors[i]
+				if self.directed or u < v:
+					edge_list.append((u, v))
+		return edge_list
+
+	def transpose(self):
+		"""Return the transpose of this graph."""
+		edges = []
+		for u in range(self.card_V):
+			for edge in self.get_adj_list(u):
+				if self.directed or u < edge.v:
+					edges.append((edge.v, u, edge.weight) if self.weighted else (edge.v, u))
+		return CSRGraph(self.card_V, edges, self.directed, self.weighted)
+
+	def adjacency_matrix(self):
+		"""Return the adjacency-matrix representation of this graph."""
+		matrix = AdjacencyMatrixGraph(self.card_V, self.directed, self.weighted)
+		for u in range(self.card_V):
+			for edge in self.get_adj_list(u):
+				if self.directed or u < edge.v:
+					matrix.insert_edge(u, edge.v, edge.weight)
+		return matrix
+
+	def __str__(self):
+		"""Return the adjacency lists formatted as a string."""
+		return self.strmap()
+
+	def strmap(self, mapping_func=None):
+		"""Return the adjacency lists formatted as a string, but mapping vertex numbers
+		by a mapping function.  If mapping_func is None, then do not map."""
+		if mapping_func is None:
+			mapping_func = lambda i: i
+
+		result = ""
+		for i in range(self.card_V):
+			result += str(mapping_func(i)) + ": "
+			for edge in self.get_adj_list(i):
+				result += edge.strmap(mapping_func) + " "
+			result += "\n"
+		return result
+
+
+# Testing
+if __name__ == "__main__":
+
+	from adjacency_list_graph import AdjacencyListGraph
+	from dijkstra import dijkstra
+	from bfs import bfs
+	from mst import kruskal, prim, get_total_weight
+
+	# Textbook example from mst.py.
+	vertices = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i']
+	edges = [('a', 'b', 4), ('a', 'h', 8), ('b', 'c', 8), ('b', 'h', 11), ('c', 'd', 7),
+			 ('c', 'f', 4), ('c', 'i', 2), ('d', 'e', 9), ('d', 'f', 14), ('e', 'f', 10),
+			 ('f', 'g', 2), ('g', 'h', 1), ('g', 'i', 6), ('h', 'i', 7)]
+	list_graph = AdjacencyListGraph(len(vertices), False, True)
+	for edge in edges:
+		list_graph.insert_edge(vertices.index(edge[0]), vertices.index(edge[1]), edge[2])
+	csr_graph = CSRGraph.from_graph(list_graph)
+	print(csr_graph.strmap(lambda i: vertices[i]))
+	print(csr_graph.strmap() == list_graph.strmap())
+	print(csr_graph.get_edge_list() == list_graph.get_edge_list())
+
+	# The existing algorithms run unchanged and give the same answers.
+	for s in range(len(vertices)):
+		print(dijkstra(csr_graph, s) == dijkstra(list_graph, s), bfs(csr_graph, s) == bfs(list_graph, s))
+	print(get_total_weight(kruskal(csr_graph)) == get_total_weight(kruskal(list_graph)))
+	print(get_total_weight(prim(csr_graph, 0)) == get_total_weight(prim(list_graph, 0)))
+
+	# A frozen graph rejects changes.
+	try:
+		csr_graph.insert_edge(0, 2, 1)
+	except RuntimeError as e:
+		print(e)
@@ -30,16 +30,25 @@
 #                                                                       #
 #########################################################################
 #
+from heapq import heappush, heappop
 from single_source_shortest_paths import initialize_single_source, relax
 from min_heap_priority_queue import MinHeapPriorityQueue
+from indexed_dary_heap import IndexedDaryHeap
+from csr_graph import CSRGraph
 
 
-def dijkstra(G, s):
+def dijkstra(G, s, target=None, heap_arity=None):
 	"""Solve single-source shortest-paths problem with no negative-weight edges.
 
 	Arguments:
 	G -- a directed, weighted graph
 	s -- index of source vertex
+	target -- optional index of a target vertex.  If given, stop as soon as the
+	target is extracted; d and pi are then final only for vertices already extracted,
+	which include every vertex on the shortest path to the target.
+	heap_arity -- if given, use an IndexedDaryHeap with this many children per node
+	as the priority queue, instead of a MinHeapPriorityQueue.  Vertices then enter the
+	queue only when first reached.
 	Assumption:
 	All weights are nonnegative
 
@@ -52,6 +61,23 @@ def dijkstra(G, s):
 
 	d, pi = initialize_single_source(G, s)
 
+	if heap_arity is not None:
+		queue = IndexedDaryHeap(card_V, heap_arity)
+		queue.insert(s, 0)
+		while queue.get_size() > 0:
+			u = queue.extract_min()
+			if u == target:
+				break
+			d_u = d[u]
+			for edge in G.get_adj_list(u):
+				v = edge.get_v()
+				d_v = d_u + edge.get_weight()
+				if d_v < d[v]:  # relax, then insert v or decrease its key
+					d[v] = d_v
+					pi[v] = u
+					queue.insert_or_decrease(v, d_v)
+		return d, pi
+
 	# Key function for the priority queue is distance.
 	queue = MinHeapPriorityQueue(lambda u: d[u])
 	for u in range(card_V):
@@ -59,6 +85,8 @@ def dijkstra(G, s):
 
 	while queue.get_size() > 0:  # while the priority queue is not empty
 		u = queue.extract_min()  # extract a vertex with the minimum distance
+		if u == target:  # the target's distance is final, so stop early
+			break
 
 		# Relax each edge and update d and pi.
 		for edge in G.get_adj_list(u):
@@ -70,6 +98,67 @@ def dijkstra(G, s):
 	return d, pi
 
 
+def dijkstra_lazy(G, s, target=None):
+	"""Solve single-source shortest-paths problem with no negative-weight edges,
+	using a binary heap of (distance, vertex) pairs with lazy deletion.
+	Instead of decreasing keys, an improved distance is pushed as a new entry,
+	and entries for vertices that are already finished are skipped when popped.
+	The heap holds only vertices that have been reached.  On a CSRGraph, the rows of
+	its arrays are walked directly, without building an edge object per neighbor.
+
+	Arguments:
+	G -- a directed, weighted graph
+	s -- index of source vertex
+	target -- optional index of a target vertex, at which to stop early as in dijkstra
+	Assumption:
+	All weights are nonnegative
+
+	Returns:
+	d -- distances from source vertex s
+	pi -- predecessors
+	"""
+	d, pi = initialize_single_source(G, s)
+	finished = [False] * G.get_card_V()
+
+	heap = [(0, s)]
+	if isinstance(G, CSRGraph):
+		offsets, neighbors, weights = G.get_arrays()
+		while heap:
+			d_u, u = heappop(heap)
+			if finished[u]:
+				continue
+			finished[u] = True
+			if u == target:
+				break
+			for i in range(offsets[u], offsets[u + 1]):
+				v = neighbors[i]
+				d_v = d_u + weights[i]
+				if d_v < d[v]:
+					d[v] = d_v
+					pi[v] = u
+					heappush(heap, (d_v, v))
+		return d, pi
+
+	while heap:  # while the priority queue is not empty
+		d_u, u = heappop(heap)  # extract a vertex with the minimum distance
+		if finished[u]:  # stale entry for a vertex already extracted?
+			continue
+		finished[u] = True
+		if u == target:  # the target's distance is final, so stop early
+			break
+
+		# Relax each edge and update d and pi, pushing v again when its distance improves.
+		for edge in G.get_adj_list(u):
+			v = edge.get_v()
+			d_v = d_u + edge.get_weight()
+			if d_v < d[v]:
+				d[v] = d_v
+				pi[v] = u
+				heappush(heap, (d_v, v))
+
+	return d, pi
+
+
 # Testing
 if __name__ == "__main__":
 
@@ -88,6 +177,8 @@ if __name__ == "__main__":
 	for i in range(len(vertices)):
 		print(vertices[i] + ": d = " + str(d[i]) + ", pi = " + ("None" if pi[i] is None else vertices[pi[i]]))
 	print()
+	print(dijkstra_lazy(graph1, vertices.index('s')) == (d, pi))
+	print()
 
 	# Larger example with all single-source shortest paths.
 	card_V = 100
@@ -101,5 +192,9 @@ if __name__ == "__main__":
 		if bf_d != dijkstra_d:
 			print("Shortest-path distances mismatch for source vertex", s)
 			all_equal = False
+		lazy_d, lazy_pi = dijkstra_lazy(graph2, s)
+		if lazy_d != dijkstra_d:
+			print("Lazy-deletion distances mismatch for source vertex", s)
+			all_equal = False
 		# Don't check whether pi values are equal because shortest paths might not be unique.
 	print("All shortest-path distances are " + ("not " if not all_equal else "") + "equal")
\ No newline at end of file
@@ -82,6 +82,94 @@ def link(x, y):
 			y.rank += 1
 
 
+class DisjointSet:
+
+	def __init__(self, n):
+		"""Initialize n singleton sets {0}, {1}, ..., {n-1}, kept in lists of ints rather
+		than a node object per element.  parent[x] is the parent of x, and a root is its
+		own parent and is the representative.  size[r] is the number of elements in the
+		set whose root is r.
+
+		Arguments:
+		n -- number of elements
+		"""
+		self.parent = list(range(n))
+		self.size = [1] * n
+		self.card_sets = n
+
+	def get_card_sets(self):
+		"""Return the number of disjoint sets."""
+		return self.card_sets
+
+	def find(self, x):
+		"""Return the root of the set containing x.  Iterative path halving: each node on
+		the find path is pointed at its grandparent, which shortens the path as much as
+		path compression does over a sequence of operations, without recursion."""
+		parent = self.parent
+		while parent[x] != x:
+			parent[x] = parent[parent[x]]
+			x = parent[x]
+		return x
+
+	def union(self, x, y):
+		"""Unite the set containing x and the set containing y, linking the root of the
+		smaller set under the root of the larger one.  Return True if they were
+		different sets, False if x and y were already in the same set."""
+		x = self.find(x)
+		y = self.find(y)
+		if x == y:
+			return False
+		if self.size[x] < self.size[y]:
+			x, y = y, x
+		self.parent[y] = x  # the larger set's root becomes the parent
+		self.size[x] += self.size[y]
+		self.card_sets -= 1
+		return True
+
+	def same_set(self, x, y):
+		"""Return True if x and y are in the same set, False otherwise."""
+		return self.find(x) == self.find(y)
+
+	def get_set_size(self, x):
+		"""Return the number of elements in the set containing x."""
+		return self.size[self.find(x)]
+
+	def find_many(self, xs):
+		"""Return the list of roots of the sets containing each element of xs."""
+		parent = self.parent
+		roots = []
+		for x in xs:
+			while parent[x] != x:
+				parent[x] = parent[parent[x]]
+				x = parent[x]
+			roots.append(x)
+		return roots
+
+	def union_many(self, pairs):
+		"""Unite the sets of each pair (x, y) in turn.  Return a list of booleans telling
+		for each pair whether it united two different sets."""
+		parent = self.parent
+		size = self.size
+		united = []
+		for x, y in pairs:
+			while parent[x] != x:
+				parent[x] = parent[parent[x]]
+				x = parent[x]
+			while parent[y] != y:
+				parent[y] = parent[parent[y]]
+				y = parent[y]
+			if x == y:
+				united.append(False)
+				continue
+			if size[x] < size[y]:
+				x, y = y, x
+			parent[y] = x
+			size[x] += size[y]
+			united.append(True)
+		self.card_sets -= united.count(True)
+		return united
+
+
 def print_find_path(x):
 	"""Print the find path starting from node x to the root."""
 	while x != x.parent:
@@ -119,3 +207,20 @@ if __name__ == "__main__":
 	union(sets[0], sets[4])
 	for s in sets:
 		print_find_path(s)
+
+	# The same unions with the array-backed DisjointSet.
+	ds = DisjointSet(len(letters))
+	print(ds.union_many([(i, i + 1) for i in range(0, len(letters), 2)]))
+	print(ds.union_many([(i, i + 2) for i in range(0, len(letters), 4)]), ds.get_card_sets())
+	ds.union(0, 4)
+	print([letters[r] for r in ds.find_many(range(len(letters)))], ds.get_card_sets(), ds.get_set_size(3))
+	print(ds.union(1, 7), ds.same_set(2, 6))
+
+	# A long chain must not reach the recursion limit.
+	n = 100000
+	ds = DisjointSet(n)
+	for i in range(n - 1):
+		ds.parent[i] = i + 1  # a worst-case path, built directly
+	ds.size[n - 1] = n
+	ds.card_sets = 1
+	print(ds.find(0), ds.get_set_size(0))
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# dynamic_shortest_paths.py
+
+from heapq import heapify, heappush, heappop
+import numpy as np
+from dijkstra import dijkstra_lazy
+
+
+def affected_vertices(G, pi, changed_edges):
+	"""Return the vertices whose shortest-path tree paths use one of the changed edges:
+	the subtrees hanging below the changed edges that are in the tree.
+
+	Arguments:
+	G -- the graph
+	pi -- predecessors of the tree
+	changed_edges -- iterable of (u, v) pairs for the deleted or heavier edges
+	"""
+	roots = []
+	for u, v in changed_edges:
+		if pi[v] == u:
+			roots.append(v)
+		if not G.is_directed() and pi[u] == v:
+			roots.append(u)
+	if not roots:
+		return []
+
+	card_V = G.get_card_V()
+	children = [[] for v in range(card_V)]
+	for v in range(card_V):
+		if pi[v] is not None:
+			children[pi[v]].append(v)
+	is_affected = [False] * card_V
+	affected = []
+	stack = roots
+	while stack:
+		x = stack.pop()
+		if not is_affected[x]:
+			is_affected[x] = True
+			affected.append(x)
+			stack.extend(children[x])
+	return affected
+
+
+def repair_affected(G, d, pi, affected, G_reverse=None):
+	"""Recompute the distances and predecessors of the affected vertices, which are all
+	that changed.  Each affected vertex is restarted from its cheapest edge out of the
+	unaffected vertices, and Dijkstra's algorithm then runs over the affected vertices
+	alone.  Edges of an unweighted graph count as weight 1.
+
+	Arguments:
+	G -- the graph, already changed
+	d -- distances before the change, updated in place
+	pi -- predecessors before the change, updated in place
+	affected -- list of vertices from affected_vertices
+	G_reverse -- the transpose of G, used to find the edges into a vertex.  Not needed
+	for an undirected graph.  For a directed graph it is computed if omitted.
+	"""
+	if not affected:
+		return
+	if G_reverse is None:
+		G_reverse = G.transpose() if G.is_directed() else G
+	weighted = G.is_weighted()
+	is_affected = [False] * G.get_card_V()
+	for x in affected:
+		is_affected[x] = True
+		d[x] = float('inf')
+		pi[x] = None
+
+	# Restart each affected vertex from its cheapest edge out of the unaffected vertices.
+	heap = []
+	for x in affected:
+		for edge in G_reverse.get_adj_list(x):
+			y = edge.get_v()
+			if not is_affected[y]:
+				d_x = d[y] + (edge.get_weight() if weighted else 1)
+				if d_x < d[x]:
+					d[x] = d_x
+					pi[x] = y
+		if d[x] != float('inf'):
+			heap.append((d[x], x))
+	heapify(heap)
+
+	# Dijkstra's algorithm confined to the affected vertices.
+	while heap:
+		d_x, x = heappop(heap)
+		if d_x > d[x]:  # stale entry?
+			continue
+		for edge in G.get_adj_list(x):
+			y = edge.get_v()
+			if is_affected[y]:
+				d_y = d_x + (edge.get_weight() if weighted else 1)
+				if d_y < d[y]:
+					d[y] = d_y
+					pi[y] = x
+					heappush(heap, (d_y, y))
+
+
+def repair_tree(G, s, d, pi, changed_edges, G_reverse=None):
+	"""Repair a shortest-path tree after edges have been deleted from G or had their
+	weights increased, in the style of Ramalingam and Reps.  Distances can only grow,
+	so a vertex whose tree path avoids every changed edge keeps its distance, and only
+	the subtrees hanging below changed tree edges need to be recomputed.
+
+	Arguments:
+	G -- the graph, already changed
+	s -- index of the source vertex of the tree
+	d -- distances from s before the change, updated in place
+	pi -- predecessors before the change, updated in place
+	changed_edges -- iterable of (u, v) pairs for the deleted or heavier edges
+	G_reverse -- the transpose of G, as in repair_affected
+	Assumption:
+	All weights are nonnegative, and no edge was inserted or made lighter
+
+	Returns:
+	affected -- list of the vertices whose distances were recomputed
+	"""
+	affected = affected_vertices(G, pi, changed_edges)
+	repair_affected(G, d, pi, affected, G_reverse)
+	return affected
+
+
+class DynamicAllPairs:
+
+	def __init__(self, G, engine=dijkstra_lazy, recompute_fraction=0.5, trees=None):
+		"""Compute a shortest-path tree from every vertex of G, and keep them up to date
+		as edges are deleted or made heavier by repairing only the affected subtrees.
+
+		Arguments:
+		G -- the graph, which this object changes through delete_edges and increase_weights
+		engine -- a single-source search returning (d, pi), used for the initial trees
+		recompute_fraction -- a tree in which more than this fraction of the vertices is
+		affected is recomputed with engine instead, which is then cheaper than a repair
+		trees -- optional list of (d, pi) trees of G to start from instead of computing
+		them, such as those from copy_trees() of another DynamicAllPairs over the same edges
+		"""
+		self.G = G
+		self.G_reverse = G.transpose() if G.is_directed() else G
+		self.engine = engine
+		self.recompute_fraction = recompute_fraction
+		self.trees = trees if trees is not None else [engine(G, s) for s in range(G.get_card_V())]
+		self.card_repaired = 0  # total number of vertex distances recomputed by repairs
+
+	def get_graph(self):
+		"""Return the graph."""
+		return self.G
+
+	def get_tree(self, s):
+		"""Return the (d, pi) lists of the tree from source s.  The caller must not change them."""
+		return self.trees[s]
+
+	def copy_trees(self):
+		"""Return a copy of every (d, pi) tree, which can be repaired without changing these."""
+		return [(d[:], pi[:]) for d, pi in self.trees]
+
+	def get_card_repaired(self):
+		"""Return the number of vertex distances that repairs have recomputed so far,
+		counting those in trees recomputed from scratch."""
+		return self.card_repaired
+
+	def repair(self, changed_edges):
+		"""Repair every tree after the edges in changed_edges were deleted or made heavier."""
+		changed_edges = list(changed_edges)
+		card_V = len(self.trees)
+		for s in range(card_V):
+			d, pi = self.trees[s]
+			affected = affected_vertices(self.G, pi, changed_edges)
+			if len(affected) > self.recompute_fraction * card_V:
+				self.trees[s] = self.engine(self.G, s)
+			else:
+				repair_affected(self.G, d, pi, affected, self.G_reverse)
+			self.card_repaired += len(affected)
+
+	def delete_edges(self, edges):
+		"""Delete each edge (u, v) in edges from the graph and repair the trees."""
+		edges = list(edges)
+		for u, v in edges:
+			self.G.delete_edge(u, v)
+			if self.G_reverse is not self.G:
+				self.G_reverse.delete_edge(v, u)
+		self.repair(edges)
+
+	def increase_weights(self, changes):
+		"""Raise the weight of each edge (u, v) in changes, given as (u, v, weight) triples,
+		and repair the trees.  The new weights must be no smaller than the old ones."""
+		changes = list(changes)
+		for u, v, weight in changes:
+			if weight < self.G.find_edge(u, v).get_weight():
+				raise RuntimeError("Edge (" + str(u) + ", " + str(v) + ") would become lighter.")
+			# The graph's own set_weight bumps its version and sets both directions of an
+			# undirected edge; a GraphOverlay records the change without touching its base.
+			self.G.set_weight(u, v, weight)
+			if self.G_reverse is not self.G:
+				self.G_reverse.set_weight(v, u, weight)
+		self.repair((u, v) for u, v, weight in changes)
+
+	def condensed_distances(self):
+		"""Return the distances of an undirected graph once per unordered pair (i, j) with
+		i < j, in row order, as a NumPy array with infinity for unreachable pairs."""
+		card_V = len(self.trees)
+		if card_V < 2:
+			return np.empty(0)
+		return np.concatenate([np.asarray(self.trees[i][0][i + 1:], dtype=float) for i in range(card_V - 1)])
+
+
+# Testing
+if __name__ == "__main__":
+
+	import random
+	from adjacency_list_graph import AdjacencyListGraph
+
+	random.seed(1828)
+	all_equal = True
+	for directed in [False, True]:
+		card_V = 60
+		graph1 = AdjacencyListGraph(card_V, directed, True, indexed=True)
+		for u in range(card_V):
+			for v in range(card_V):
+				if (directed or u < v) and u != v and random.random() < 0.08:
+					graph1.insert_edge(u, v, random.randint(1, 10))
+		dynamic = DynamicAllPairs(graph1)
+		for step in range(10):
+			edges = graph1.get_edge_list()
+			closed = random.sample(edges, 3)
+			dynamic.delete_edges(closed)
+			heavier = [(u, v, graph1.find_edge(u, v).get_weight() + random.randint(0, 5))
+					   for u, v in random.sample(graph1.get_edge_list(), 3)]
+			dynamic.increase_weights(heavier)
+			for s in range(card_V):
+				d, pi = dynamic.get_tree(s)
+				if d != dijkstra_lazy(graph1, s)[0]:
+					all_equal = False
+				for v in range(card_V):  # each predecessor edge must lie on a shortest path
+					if pi[v] is not None and d[pi[v]] + graph1.find_edge(pi[v], v).get_weight() != d[v]:
+						all_equal = False
+		print(("Directed" if directed else "Undirected") + ": recomputed", dynamic.get_card_repaired(),
+			  "of", 20 * card_V * card_V, "distances")
+	print("All repaired distances are " + ("not " if not all_equal else "") + "equal")
+
+	# Raising a weight changes the graph's version, so a cache of its trees is not stale.
+	from path_cache import ShortestPathCache
+	cache = ShortestPathCache()
+	cache.get_tree(graph1, 0, dijkstra_lazy)
+	dynamic.increase_weights([(u, v, graph1.find_edge(u, v).get_weight() + 100) for u, v in graph1.get_edge_list()[:20]])
+	print(cache.get_tree(graph1, 0, dijkstra_lazy)[0] == dynamic.get_tree(0)[0])
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# external_sort.py
+
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from heapq import merge
+from itertools import islice
+from numbers import Integral
+import numpy as np
+from bottom_up_merge_sort import bottom_up_merge_sort
+
+# One edge per record.  Records compare field by field, so sorting whole records orders
+# the edges by weight, with ties kept in input order by the index field.  Integer weights
+# are kept as integers, so that they come back exactly and with the same type.
+EDGE_RECORD = np.dtype([('weight', np.float64), ('index', np.int64), ('u', np.int64), ('v', np.int64)])
+INTEGER_EDGE_RECORD = np.dtype([('weight', np.int64), ('index', np.int64), ('u', np.int64), ('v', np.int64)])
+
+
+def sort_run(records, file_path):
+	"""Sort a chunk of edge records and write it to file_path as raw binary records.
+	Return the file path and the record type needed to read it back.  Run in a worker
+	process when external_sort_edges is given workers."""
+	bottom_up_merge_sort(records)  # NumPy's stable sort, in place
+	records.tofile(file_path)
+	return file_path, records.dtype
+
+
+def read_run(file_path, record, block_size):
+	"""Generate the (weight, index, u, v) tuples of a sorted run file of the given record
+	type, reading block_size records at a time through a memory map."""
+	run = np.memmap(file_path, dtype=record, mode='r')
+	for start in range(0, len(run), block_size):
+		yield from run[start:start + block_size].tolist()
+	del run
+
+
+def external_sort_edges(edges, chunk_size=1000000, workers=None, directory=None, block_size=65536):
+	"""Generate edges in nondecreasing order of weight, holding about chunk_size edges in
+	memory at a time, or about (workers + 1) * chunk_size with workers, since up to
+	workers chunks wait to be sorted while the next one is read.  The edges are read in
+	chunks, and each chunk is sorted, in a process pool if workers is given, and spilled
+	to a temporary file as a run of fixed-size binary records.  The runs are then merged
+	k ways with a heap.  Equal weights keep their input order, so the output is the same
+	as a stable sort's.  A chunk whose weights are all integers is stored with 64-bit
+	integer weights, and any other chunk with float weights.
+
+	The temporary files are deleted when the generator finishes or is closed, so a
+	consumer may stop early.
+
+	Arguments:
+	edges -- iterable of (u, v, weight) triples with integer vertices
+	chunk_size -- number of edges per sorted run
+	workers -- if given, sort the runs in this many worker processes
+	directory -- directory for the temporary files, or None for the system default
+	block_size -- number of records to read from each run at a time while merging
+	"""
+	with tempfile.TemporaryDirectory(dir=directory) as run_directory:
+		runs = []  # (file path, record type) of each sorted run
+		executor = ProcessPoolExecutor(max_workers=workers) if workers is not None else None
+		try:
+			edges = iter(edges)
+			index = 0
+			pending = []
+			while True:
+				chunk = list(islice(edges, chunk_size))
+				if not chunk:
+					break
+				tails, heads, weights = zip(*chunk)
+				integral = all(isinstance(weight, Integral) for weight in weights)
+				records = np.empty(len(chunk), dtype=INTEGER_EDGE_RECORD if integral else EDGE_RECORD)
+				records['u'], records['v'], records['weight'] = tails, heads, weights
+				records['index'] = np.arange(index, index + len(chunk))
+				index += len(chunk)
+				file_path = os.path.join(run_directory, "run" + str(len(runs) + len(pending)) + ".bin")
+				if executor is None:
+					runs.append(sort_run(records, file_path))
+				else:
+					pending.append(executor.submit(sort_run, records, file_path))
+					# Keep at most one chunk per worker waiting, to bound memory.
+					if len(pending) >= workers:
+						runs.append(pending.pop(0).result())
+			runs += [future.result() for future in pending]
+		finally:
+			if executor is not None:
+				executor.shutdown()
+
+		for weight, index, u, v in merge(*[read_run(file_path, record, block_size) for file_path, record in runs]):
+			yield u, v, weight
+
+
+# Testing
+if __name__ == "__main__":
+
+	import random
+
+	random.seed(1828)
+	edges = [(random.randrange(1000), random.randrange(1000), random.randint(1, 60)) for i in range(10000)]
+	expected = sorted(edges, key=lambda edge: edge[2])  # Python's sort is stable
+	print(list(external_sort_edges(edges, chunk_size=1500)) == expected)
+	print(list(external_sort_edges(iter(edges), chunk_size=999, workers=2)) == expected)
+	float_edges = [(u, v, random.random()) for u, v, weight in edges]
+	print(list(external_sort_edges(float_edges, chunk_size=4096, block_size=100)) ==
+		  sorted(float_edges, key=lambda edge: edge[2]))
+	print(list(external_sort_edges([])))
+
+	# Integer weights beyond 2**53 come back exactly, and as ints.
+	big_edges = [(u, v, 2 ** 60 + weight) for u, v, weight in edges[:3000]]
+	big_sorted = list(external_sort_edges(big_edges, chunk_size=700))
+	print(big_sorted == sorted(big_edges, key=lambda edge: edge[2]), type(big_sorted[0][2]))
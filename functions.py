@@ -1,10 +1,31 @@
 # Import necessary libraries and modules for data handling and graph operations
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from numbers import Integral
+import hashlib
+import os
+import tempfile
+import zipfile
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 from adjacency_list_graph import AdjacencyListGraph
-from dijkstra import dijkstra
+from csr_graph import CSRGraph
+from station_index import StationIndex
+from dijkstra import dijkstra, dijkstra_lazy
 from bfs import bfs
-from mst import kruskal
+from print_path import print_path
+from dynamic_shortest_paths import DynamicAllPairs
+from graph_overlay import GraphOverlay
+from bridges import Biconnectivity, pairs_disconnected
+from betweenness import betweenness
+from bidirectional_search import bidirectional_dijkstra, bidirectional_bfs
+from astar import astar
+from contraction_hierarchies import ch_query
+from all_pairs_shortest_paths import weight_matrix, floyd_warshall, stop_counts, upper_triangle_values
+from mst import kruskal_arrays, kruskal_stream
+from external_sort import external_sort_edges
 
 
 # Define a function to load data from an Excel file
@@ -29,36 +50,96 @@ def get_unique_stations(data):
     # Create a set of all unique station names and sort them
     stations_set = set(data['Station (from)']).union(set(data['Station (to)']))
     stations_sorted_list = sorted(stations_set)
-    # Map each station name to a unique index
-    station_map = {station: index for index, station in enumerate(stations_sorted_list)}
+    # Map each station name to a unique index, with the names also kept in index order for reverse lookups
+    station_map = StationIndex(stations_sorted_list)
     return station_map
 
 
+# Define a function to extract deduplicated edges as arrays, processing all rows at once
+def extract_edge_arrays(data, station_map):
+    # Map station names to their indices in bulk
+    from_codes = data['Station (from)'].map(station_map)
+    to_codes = data['Station (to)'].map(station_map)
+    unknown = data.loc[from_codes.isna() | to_codes.isna(), ['Station (from)', 'Station (to)']]
+    if len(unknown) > 0:
+        missing = sorted(set(unknown.to_numpy().ravel()) - set(station_map))
+        raise KeyError(f"Stations missing from the station map: {missing}")
+    from_codes = from_codes.to_numpy(dtype=np.int64)
+    to_codes = to_codes.to_numpy(dtype=np.int64)
+
+    # Order each edge's endpoints as (smaller index, larger index) so both directions share a key
+    edges = pd.DataFrame({'from_index': np.minimum(from_codes, to_codes),
+                          'to_index': np.maximum(from_codes, to_codes),
+                          'time': data['Time (minutes)'].to_numpy()})
+    # Keep the minimum time of duplicate connections, in order of first appearance
+    shortest = edges.groupby(['from_index', 'to_index'], sort=False)['time'].min()
+
+    return (shortest.index.get_level_values('from_index').to_numpy(),
+            shortest.index.get_level_values('to_index').to_numpy(),
+            shortest.to_numpy())
+
+
 # Define a function to map station pairs to their corresponding indices and associated data
 def map_stations_to_indices(data, station_map):
-    edges_dict = {}
-    for _, row in data.iterrows():
-        # Extract station names and journey time from the row
-        from_station, to_station, time = row['Station (from)'], row['Station (to)'], row['Time (minutes)']
-        # Retrieve indices for the stations
-        from_index = station_map[from_station]
-        to_index = station_map[to_station]
-        # Create a sorted tuple key to represent the edge
-        edge_key = tuple(sorted((from_index, to_index)))
-
-        # If the edge already exists, retain the minimum time; otherwise, add the new edge
-        if edge_key in edges_dict:
-            edges_dict[edge_key] = {
-                'time': min(time, edges_dict[edge_key]['time']),  # keep the minimum time
-                'stops': 1  # constant for a single stop
-            }
-        else:
-            edges_dict[edge_key] = {
-                'time': time,  # initial time
-                'stops': 1  # constant for a single stop
-            }
+    from_indices, to_indices, times = extract_edge_arrays(data, station_map)
+    # Each connection counts as a single stop
+    return {(from_index, to_index): {'time': time, 'stops': 1}
+            for from_index, to_index, time in zip(from_indices.tolist(), to_indices.tolist(), times.tolist())}
+
+
+# Define a function to read connection records from a CSV or JSON Lines file, a chunk of rows at a time
+def read_connection_chunks(file_path, chunk_size=100000):
+    columns = ['Station (from)', 'Station (to)', 'Time (minutes)']
+    if file_path.endswith(('.jsonl', '.ndjson')):
+        reader = pd.read_json(file_path, lines=True, chunksize=chunk_size)
+    elif file_path.endswith('.csv'):
+        reader = pd.read_csv(file_path, usecols=columns, chunksize=chunk_size)
+    else:
+        raise ValueError("Streaming ingestion supports .csv, .jsonl and .ndjson files")
+
+    with reader:
+        for chunk in reader:
+            # Keep only the needed columns, cleaned the same way as the spreadsheet
+            chunk = chunk[columns].copy()
+            clean_station_names(chunk)
+            yield chunk
+
 
-    return edges_dict
+# Define a function to build the station map and edges from a large connection feed with bounded memory
+def ingest_network(file_path, chunk_size=100000, sort_stations=True):
+    station_map = StationIndex()
+    edges_dict = {}
+    for chunk in read_connection_chunks(file_path, chunk_size):
+        # Give stations seen for the first time the next free indices, in order of appearance
+        for station in pd.unique(chunk[['Station (from)', 'Station (to)']].to_numpy().ravel()):
+            station_map.add(station)
+
+        # Merge the chunk's deduplicated edges, keeping the minimum time across chunks
+        from_indices, to_indices, times = extract_edge_arrays(chunk, station_map)
+        for from_index, to_index, time in zip(from_indices.tolist(), to_indices.tolist(), times.tolist()):
+            weights = edges_dict.get((from_index, to_index))
+            if weights is None:
+                edges_dict[(from_index, to_index)] = {'time': time, 'stops': 1}
+            elif time < weights['time']:
+                weights['time'] = time
+
+    if sort_stations:
+        # Renumber stations alphabetically so that indices match prepare_data for the same records
+        order = StationIndex(sorted(station_map))
+        renumber = [0] * len(station_map)
+        for station, index in station_map.items():
+            renumber[index] = order[station]
+        station_map = order
+        edges_dict = {tuple(sorted((renumber[from_index], renumber[to_index]))): weights
+                      for (from_index, to_index), weights in edges_dict.items()}
+
+    return station_map, edges_dict
+
+
+# Define a function to build a graph directly from a streamed connection feed
+def ingest_graph(file_path, weight_type, chunk_size=100000, frozen=False):
+    station_map, edges_dict = ingest_network(file_path, chunk_size)
+    return station_map, create_graph(station_map, edges_dict, weight_type, frozen)
 
 
 # Define a function to orchestrate the data preparation steps
@@ -76,13 +157,115 @@ def prepare_data(file_path):
     return data, station_map, edges_dict
 
 
+# Define a function to work out where the prepared-network cache for a data file is stored
+def network_cache_path(file_path):
+    return os.path.splitext(file_path)[0] + '.network.npz'
+
+
+# Define a function to compute a content hash of a file, read in blocks
+def file_digest(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# Define a function to save the prepared station map and edges as compact arrays in a NumPy .npz file
+def save_network_cache(cache_path, file_path, station_map, edges_dict, digest=None):
+    # Station names are stored in index order, so that position i holds the station with index i
+    stations = as_station_index(station_map).get_names()
+    edge_keys = list(edges_dict)
+    source = os.stat(file_path)
+    # Write to a temporary file in the same directory and move it into place, so that an interrupted
+    # run never leaves a half-written cache behind
+    fd, temp_path = tempfile.mkstemp(suffix='.npz', dir=os.path.dirname(os.path.abspath(cache_path)))
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            np.savez(file,
+                     stations=np.array(stations, dtype=str),
+                     from_index=np.array([u for u, v in edge_keys], dtype=np.int32),
+                     to_index=np.array([v for u, v in edge_keys], dtype=np.int32),
+                     time=np.array([edges_dict[key]['time'] for key in edge_keys]),
+                     stops=np.array([edges_dict[key]['stops'] for key in edge_keys]),
+                     source_size=source.st_size,
+                     source_mtime_ns=source.st_mtime_ns,
+                     source_sha256=digest if digest is not None else file_digest(file_path))
+        os.replace(temp_path, cache_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+# Define a function to load the cached station map and edges, or return None if the cache is missing or stale
+def load_network_cache(cache_path, file_path):
+    if not os.path.exists(cache_path) or not os.path.exists(file_path):
+        return None
+    try:
+        with np.load(cache_path) as cache:
+            source = os.stat(file_path)
+            # The size and modification time are checked first; the hash only when the time has changed
+            if int(cache['source_size']) != source.st_size:
+                return None
+            digest = None
+            if int(cache['source_mtime_ns']) != source.st_mtime_ns:
+                digest = file_digest(file_path)
+                if str(cache['source_sha256']) != digest:
+                    return None
+
+            station_map = StationIndex(cache['stations'].tolist())
+            edges_dict = {(u, v): {'time': time, 'stops': stops}
+                          for u, v, time, stops in zip(cache['from_index'].tolist(), cache['to_index'].tolist(),
+                                                       cache['time'].tolist(), cache['stops'].tolist())}
+    except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile) as e:
+        # A damaged cache, such as one cut short, is treated as a miss and rebuilt
+        print(f"Ignoring unreadable network cache: {e}")
+        return None
+
+    # The file was touched but its contents are the same, so record the new time to avoid hashing it again
+    if digest is not None:
+        try:
+            save_network_cache(cache_path, file_path, station_map, edges_dict, digest)
+        except OSError as e:
+            print(f"Could not write network cache: {e}")
+    return station_map, edges_dict
+
+
+# Define a function to prepare the station map and edges, reusing the cache while the data file is unchanged
+def prepare_network(file_path, use_cache=True):
+    cache_path = network_cache_path(file_path)
+    if use_cache:
+        cached = load_network_cache(cache_path, file_path)
+        if cached is not None:
+            return cached
+
+    # Cache miss: read the spreadsheet and rebuild the cache for next time
+    preparation_result = prepare_data(file_path)
+    if preparation_result is None:
+        return None
+    data, station_map, edges_dict = preparation_result
+    if use_cache:
+        try:
+            save_network_cache(cache_path, file_path, station_map, edges_dict)
+        except OSError as e:
+            print(f"Could not write network cache: {e}")
+
+    return station_map, edges_dict
+
+
 # Define a function to create a graph from the station and edge data
-def create_graph(station_map, edges_dict, weight_type):
+def create_graph(station_map, edges_dict, weight_type, frozen=False):
     if weight_type not in ['time', 'stops']:
         raise ValueError("weight_type must be either 'time' or 'stops'")
 
+    # A frozen graph is built in one pass into compressed sparse row arrays
+    if frozen:
+        edges = ((from_index, to_index, weights[weight_type]) for (from_index, to_index), weights in edges_dict.items())
+        return CSRGraph(len(station_map), edges, directed=False, weighted=True)
+
     # Instantiate a new AdjacencyListGraph with the size based on the station map
-    graph = AdjacencyListGraph(len(station_map), directed=False, weighted=True)
+    # Indexed adjacency lists keep edge insertion and deletion in constant expected time
+    graph = AdjacencyListGraph(len(station_map), directed=False, weighted=True, indexed=True)
     # Insert edges with the appropriate weights into the graph
     for (from_index, to_index), weights in edges_dict.items():
         try:
@@ -93,8 +276,19 @@ def create_graph(station_map, edges_dict, weight_type):
     return graph
 
 
+# Define a function to get a StationIndex for a station map, converting a plain dictionary once if needed
+def as_station_index(station_map):
+    if isinstance(station_map, StationIndex):
+        return station_map
+    return StationIndex.from_mapping(station_map)
+
+
 # Define a function to perform reverse lookup from index to station name
 def reverse_lookup(station_map, index):
+    if index is None:
+        return None
+    if isinstance(station_map, StationIndex):
+        return station_map.get_name(index)  # constant-time lookup in the index-ordered names
     for station, idx in station_map.items():
         if idx == index:
             return station
@@ -103,24 +297,17 @@ def reverse_lookup(station_map, index):
 
 # Define a function to reconstruct the path from predecessor indices
 def reconstruct_path(predecessors, station_map, start_index, end_index):
-    path = []
-    current_index = end_index
-    # Backtrack from the destination index to the start index using the predecessors
-    while current_index != start_index:
-        current_station = reverse_lookup(station_map, current_index)
-        if current_station:
-            path.insert(0, current_station)
-            current_index = predecessors[current_index]
-        else:
-            print("Station index not found in map.")
-            return []
-    # Insert the start station at the beginning of the path
-    path.insert(0, reverse_lookup(station_map, start_index))
+    station_map = as_station_index(station_map)
+    # Backtrack from the destination index to the start index using the predecessors, without recursion
+    path = print_path(predecessors, start_index, end_index, station_map.get_name)
+    if path is None or None in path:
+        print("Station index not found in map.")
+        return []
     return path
 
 
 # Define a function to find the shortest path between two stations using a specified algorithm
-def find_shortest_path(graph, station_map, start_station, end_station, algorithm):
+def find_shortest_path(graph, station_map, start_station, end_station, algorithm, landmarks=None, cache=None):
     if start_station not in station_map or end_station not in station_map:
         print("One or both of the stations are invalid.")
         return [], 0
@@ -129,11 +316,26 @@ def find_shortest_path(graph, station_map, start_station, end_station, algorithm
     start_index = station_map[start_station]
     end_index = station_map[end_station]
 
-    # Execute the appropriate algorithm to find the shortest path
-    if algorithm == dijkstra:
-        distances, predecessors = dijkstra(graph, start_index)
-    elif algorithm == bfs:
-        distances, predecessors = bfs(graph, start_index)
+    # Point-to-point searches return the path of indices and its total directly;
+    # for ch_query the graph argument is a ContractionHierarchy built from the same data
+    if algorithm in (bidirectional_dijkstra, bidirectional_bfs, astar, ch_query):
+        if algorithm == astar:
+            # A* uses the precomputed landmark tables (see preprocess_landmarks) as its heuristic
+            path_indices, total_value = astar(graph, start_index, end_index, landmarks)
+        else:
+            path_indices, total_value = algorithm(graph, start_index, end_index)
+        if not path_indices:
+            print(f"No path exists between {start_station} and {end_station}.")
+            return [], 0
+        station_map = as_station_index(station_map)
+        return [reverse_lookup(station_map, index) for index in path_indices], total_value
+
+    # Execute the appropriate algorithm, stopping as soon as the destination is settled;
+    # with a ShortestPathCache, the whole tree for the start station is reused across queries instead
+    if algorithm in (dijkstra, dijkstra_lazy, bfs) and cache is not None:
+        distances, predecessors = cache.get_tree(graph, start_index, algorithm)
+    elif algorithm in (dijkstra, dijkstra_lazy, bfs):
+        distances, predecessors = algorithm(graph, start_index, target=end_index)
     else:
         raise ValueError("Unsupported algorithm")
 
@@ -150,23 +352,135 @@ def find_shortest_path(graph, station_map, start_station, end_station, algorithm
     return path, total_value
 
 
-# Define a function to calculate all journey metrics across the graph for either time or stops
-def calculate_all_journeys(graph_time, graph_stops, station_map, algorithm, calculation_type):
-    all_journey_times = set()
-    all_journey_stops = set()
+# Graphs and algorithm used by a worker process, set once per worker by init_journey_worker
+worker_state = {}
+
+
+# Define a function that stores the shared graphs in a worker process when the pool starts
+def init_journey_worker(graph_time, graph_stops, algorithm):
+    worker_state['graph_time'] = graph_time
+    worker_state['graph_stops'] = graph_stops
+    worker_state['algorithm'] = algorithm
 
-    for start_station, start_index in station_map.items():
+
+# Define a function to compute the distances from a batch of start stations
+def journeys_from_sources(start_indices, calculation_type, graph_time=None, graph_stops=None, algorithm=None,
+                          upper_only=False):
+    # Inside a worker process, fall back to the graphs stored by the initializer
+    graph_time = graph_time if graph_time is not None else worker_state.get('graph_time')
+    graph_stops = graph_stops if graph_stops is not None else worker_state.get('graph_stops')
+    algorithm = algorithm if algorithm is not None else worker_state.get('algorithm')
+
+    results = []
+    for start_index in start_indices:
+        distances_time = distances_stops = None
         if calculation_type in ['time', 'both']:
             # Calculate distances for journey times
             distances_time, *_ = algorithm(graph_time, start_index)
+        if calculation_type in ['stops', 'both']:
+            # Calculate distances for journey stops
+            distances_stops, *_ = algorithm(graph_stops, start_index)
+        if upper_only:
+            # Keep only the stations after the start station, packed as doubles, for the condensed form
+            distances_time = array('d', distances_time[start_index + 1:]) if distances_time is not None else None
+            distances_stops = array('d', distances_stops[start_index + 1:]) if distances_stops is not None else None
+        results.append((start_index, distances_time, distances_stops))
+    return results
+
+
+# Define a function to run journeys_from_sources serially or split across a pool of worker processes
+def run_journeys(start_indices, calculation_type, graph_time, graph_stops, algorithm, workers=None, upper_only=False):
+    if workers is None:
+        # Compute every start station one after another in this process
+        return journeys_from_sources(start_indices, calculation_type, graph_time, graph_stops, algorithm, upper_only)
+
+    # Split the start stations into a few batches per worker; each worker receives the graphs
+    # once through the pool initializer, and map() returns the batches in submission order
+    batch_size = max(1, -(-len(start_indices) // (workers * 4)))
+    batches = [start_indices[i:i + batch_size] for i in range(0, len(start_indices), batch_size)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_journey_worker,
+                             initargs=(graph_time, graph_stops, algorithm)) as executor:
+        return [result for batch_results in executor.map(journeys_from_sources, batches, repeat(calculation_type),
+                                                         repeat(None), repeat(None), repeat(None), repeat(upper_only))
+                for result in batch_results]
+
+
+# Define a function to find where the pair (i, j), with i < j, is stored in a condensed distance array
+def condensed_index(i, j, card_V):
+    return card_V * i - i * (i + 1) // 2 + (j - i - 1)
+
+
+# Define a function to store the journeys of an undirected graph once per unordered pair of stations; it still
+# runs one full search from every station but the last, so only the collection of results is halved
+def calculate_all_journeys_condensed(graph_time, graph_stops, algorithm, calculation_type, workers=None):
+    graph = graph_time if calculation_type in ['time', 'both'] else graph_stops
+    card_V = graph.get_card_V()
+    size = card_V * (card_V - 1) // 2
+
+    # Preallocate one slot per pair (i, j) with i < j, in row order; unreachable pairs stay infinite
+    times = np.full(size, np.inf) if calculation_type in ['time', 'both'] else None
+    stops = np.full(size, np.inf) if calculation_type in ['stops', 'both'] else None
+
+    # The last station has no stations after it, so it never needs to be a start station
+    results = run_journeys(list(range(card_V - 1)), calculation_type, graph_time, graph_stops, algorithm,
+                           workers, upper_only=True)
+    for start_index, distances_time, distances_stops in results:
+        offset = condensed_index(start_index, start_index + 1, card_V)
+        if times is not None:
+            times[offset:offset + len(distances_time)] = distances_time
+        if stops is not None:
+            stops[offset:offset + len(distances_stops)] = distances_stops
+
+    if calculation_type == 'time':
+        return times
+    elif calculation_type == 'stops':
+        return stops
+    else:
+        return times, stops
+
+
+# Define a function to check whether every journey value found by an algorithm on a graph is a whole number
+def has_integral_weights(graph, algorithm):
+    if algorithm is bfs or not graph.is_weighted():
+        return True
+    return all(isinstance(edge.get_weight(), Integral)
+               for u in range(graph.get_card_V()) for edge in graph.get_adj_list(u))
+
+
+# Define a function to list the finite values of a condensed array, as integers when the weights are integers
+def finite_values(values, integral):
+    values = values[np.isfinite(values)]
+    return values.astype(np.int64).tolist() if integral else values.tolist()
+
+
+# Define a function to calculate all journey metrics across the graph for either time or stops
+def calculate_all_journeys(graph_time, graph_stops, station_map, algorithm, calculation_type, workers=None):
+    # Undirected graphs give the same journey in both directions, so each pair is stored once; there is
+    # still one search per start station, but only the stations after it are collected
+    graphs = []
+    if calculation_type in ['time', 'both']:
+        graphs.append(graph_time)
+    if calculation_type in ['stops', 'both']:
+        graphs.append(graph_stops)
+    if not any(graph.is_directed() for graph in graphs):
+        condensed = calculate_all_journeys_condensed(graph_time, graph_stops, algorithm, calculation_type, workers)
+        if calculation_type == 'both':
+            return [finite_values(values, has_integral_weights(graph, algorithm))
+                    for values, graph in zip(condensed, graphs)]
+        return finite_values(condensed, has_integral_weights(graphs[0], algorithm))
+
+    all_journey_times = set()
+    all_journey_stops = set()
+    results = run_journeys(list(station_map.values()), calculation_type, graph_time, graph_stops, algorithm, workers)
+
+    for start_index, distances_time, distances_stops in results:
+        if distances_time is not None:
             for end_index in range(len(distances_time)):
                 if end_index != start_index and distances_time[end_index] != float('inf'):
                     journey = tuple(sorted([start_index, end_index]))
                     all_journey_times.add((journey, distances_time[end_index]))
 
-        if calculation_type in ['stops', 'both']:
-            # Calculate distances for journey stops
-            distances_stops, *_ = algorithm(graph_stops, start_index)
+        if distances_stops is not None:
             for end_index in range(len(distances_stops)):
                 if end_index != start_index and distances_stops[end_index] != float('inf'):
                     journey = tuple(sorted([start_index, end_index]))
@@ -180,13 +494,38 @@ def calculate_all_journeys(graph_time, graph_stops, station_map, algorithm, calc
         return [time for journey, time in all_journey_times], [stops for journey, stops in all_journey_stops]
 
 
+# Define a function to calculate all journey metrics at once with vectorized matrix algorithms
+def calculate_all_journeys_matrix(graph, calculation_type):
+    if calculation_type not in ['time', 'stops']:
+        raise ValueError("calculation_type must be either 'time' or 'stops'")
+
+    # Build the weight matrix once, with infinity wherever two stations are not connected
+    weights = weight_matrix(graph)
+    # Journey times come from Floyd-Warshall; stop counts from breadth-first matrix products
+    if calculation_type == 'time':
+        distances = floyd_warshall(weights)
+    else:
+        distances = stop_counts(weights)
+
+    # Keep one value per pair of distinct, connected stations for the histograms
+    return upper_triangle_values(distances)
+
+
 """   Functions just for task 4   """
 
 
 # Function to generate a minimum spanning tree (MST) of a graph using Kruskal's algorithm
 def generate_mst(graph):
     # The MST is generated to ensure connectivity with the minimum possible total edge weight
-    return kruskal(graph)
+    # Kruskal's algorithm on parallel edge arrays, with a counting sort for whole-minute weights
+    return kruskal_arrays(graph)
+
+
+# Function to generate the MST of a network too large to sort in memory, from a stream of (u, v, weight) edges
+def generate_mst_external(card_V, edges, chunk_size=1000000, workers=None, directory=None):
+    # Sort the edges by weight in runs spilled to disk, then let Kruskal's algorithm read the merged
+    # runs as a stream, stopping as soon as the tree spans all the stations
+    return kruskal_stream(card_V, external_sort_edges(edges, chunk_size, workers, directory))
 
 
 # Function to identify which edges can be removed from the graph based on the MST
@@ -202,6 +541,41 @@ def identify_edges_to_remove(graph, mst):
     return edges_to_remove
 
 
+# Function to calculate the betweenness of every station and connection, keyed by station names
+def calculate_betweenness(graph, station_map, algorithm, samples=None, seed=None, workers=None):
+    station_map = as_station_index(station_map)
+    vertex_scores, edge_scores = betweenness(graph, algorithm, samples, seed, workers)
+    # Sort from the most to the least shortest-path traffic
+    station_scores = {reverse_lookup(station_map, v): vertex_scores[v]
+                      for v in sorted(range(len(vertex_scores)), key=lambda v: -vertex_scores[v])}
+    connection_scores = {(reverse_lookup(station_map, u), reverse_lookup(station_map, v)): score
+                         for (u, v), score in sorted(edge_scores.items(), key=lambda item: -item[1])}
+    return station_scores, connection_scores
+
+
+# Function to rank the stations and connections whose closure alone would disconnect the network
+def criticality_report(graph, station_map):
+    station_map = as_station_index(station_map)
+    # One linear-time depth-first search finds every bridge and articulation point
+    biconnectivity = Biconnectivity(graph)
+    rows = []
+    for u, v in biconnectivity.get_bridges():
+        parts = biconnectivity.bridge_split(u, v)
+        rows.append({'type': 'connection',
+                     'name': f"{reverse_lookup(station_map, u)} -- {reverse_lookup(station_map, v)}",
+                     'journeys_lost': pairs_disconnected(parts), 'stations_cut_off': min(parts)})
+    for v in biconnectivity.get_articulation_points():
+        parts = biconnectivity.articulation_pieces(v)
+        # Journeys to and from the closed station itself are not counted
+        rows.append({'type': 'station', 'name': reverse_lookup(station_map, v),
+                     'journeys_lost': pairs_disconnected(parts), 'stations_cut_off': sum(parts) - max(parts)})
+
+    # The most critical first: those that cut the most journeys between the remaining stations
+    report = pd.DataFrame(rows, columns=['type', 'name', 'journeys_lost', 'stations_cut_off'])
+    return report.sort_values(['journeys_lost', 'type', 'name'], ascending=[False, True, True],
+                              ignore_index=True)
+
+
 # Function to simulate the closure of certain edges in the graph
 def simulate_closure(graph, edges_to_remove):
     # Iterate through the list of edges to remove
@@ -210,14 +584,82 @@ def simulate_closure(graph, edges_to_remove):
         graph.delete_edge(u, v)
 
 
+# Define a function to calculate all journeys before and after closing edges, repairing the
+# shortest-path trees of the undirected graphs instead of recomputing them from scratch; the
+# edges are closed in a copy-on-write view, so the caller's graphs are left unchanged
+def calculate_closure_journeys(graph_time, graph_stops, edges_to_remove, calculation_type='both'):
+    graphs = []
+    if calculation_type in ['time', 'both']:
+        graphs.append(graph_time)
+    if calculation_type in ['stops', 'both']:
+        graphs.append(graph_stops)
+    # The journeys are read off once per unordered pair, which holds only for undirected graphs
+    if any(graph.is_directed() for graph in graphs):
+        raise RuntimeError("Graph should be undirected.")
+
+    before, after = [], []
+    for graph in graphs:
+        # Build every tree once, read off the journeys, then close the edges and repair the trees
+        integral = has_integral_weights(graph, dijkstra_lazy)
+        dynamic = DynamicAllPairs(GraphOverlay(graph), dijkstra_lazy)
+        before.append(finite_values(dynamic.condensed_distances(), integral))
+        dynamic.delete_edges(edges_to_remove)
+        after.append(finite_values(dynamic.condensed_distances(), integral))
+
+    if calculation_type == 'both':
+        return tuple(before), tuple(after)
+    return before[0], after[0]
+
+
+# Define a function to summarise a distribution of journey values, counting the unreachable pairs separately
+def summarize_journeys(values, prefix):
+    finite = values[np.isfinite(values)]
+    if len(finite) == 0:
+        return {f'{prefix}_mean': np.nan, f'{prefix}_median': np.nan, f'{prefix}_p90': np.nan,
+                f'{prefix}_max': np.nan, f'{prefix}_unreachable': len(values)}
+    return {f'{prefix}_mean': finite.mean(), f'{prefix}_median': np.median(finite),
+            f'{prefix}_p90': np.percentile(finite, 90), f'{prefix}_max': finite.max(),
+            f'{prefix}_unreachable': len(values) - len(finite)}
+
+
+# Define a function to evaluate many closure scenarios against the same base graphs
+def run_closure_scenarios(graph_time, graph_stops, scenarios, calculation_type='both'):
+    graphs = []
+    if calculation_type in ['time', 'both']:
+        graphs.append(('time', graph_time))
+    if calculation_type in ['stops', 'both']:
+        graphs.append(('stops', graph_stops))
+    # The journeys are read off once per unordered pair, which holds only for undirected graphs
+    if any(graph.is_directed() for weight_type, graph in graphs):
+        raise RuntimeError("Graph should be undirected.")
+
+    # The shortest-path trees of the base graphs are computed once and shared by every scenario
+    base = [(weight_type, DynamicAllPairs(graph, dijkstra_lazy)) for weight_type, graph in graphs]
+    rows = []
+    for closed_edges in scenarios:
+        closed_edges = list(closed_edges)
+        row = {'closed_edges': len(closed_edges)}
+        for weight_type, dynamic in base:
+            # Each scenario closes its edges in a copy-on-write view and repairs copies of the trees,
+            # so the base graphs and trees are never changed
+            scenario = DynamicAllPairs(GraphOverlay(dynamic.get_graph()), dijkstra_lazy, trees=dynamic.copy_trees())
+            scenario.delete_edges(closed_edges)
+            row.update(summarize_journeys(scenario.condensed_distances(), weight_type))
+        rows.append(row)
+
+    # One row per scenario, in the order given
+    return pd.DataFrame(rows)
+
+
 # Function to print out the list of edges (stations) that will be removed from the graph
 def print_edges_to_remove(edges_to_remove, station_map):
+    station_map = as_station_index(station_map)
     print("Edges to remove:")
     # Iterate through the removable edges
     for u, v in edges_to_remove:
         # Look up station names from the station indices
-        station_u = [name for name, index in station_map.items() if index == u][0]
-        station_v = [name for name, index in station_map.items() if index == v][0]
+        station_u = reverse_lookup(station_map, u)
+        station_v = reverse_lookup(station_map, v)
         # Print the stations corresponding to the removable edge
         print(f"{station_u} -- {station_v}")
 
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# graph_overlay.py
+
+from adjacency_list_graph import AdjacencyListGraph, Edge
+
+
+class GraphOverlay:
+
+	def __init__(self, base, deleted_edges=(), deleted_vertices=(), weights=()):
+		"""Initialize a copy-on-write view of a graph.  The view starts out with the same
+		edges as the base graph, which it never changes: deleting an edge or changing a
+		weight is recorded in the view only, so many views can share one base graph.
+
+		Arguments:
+		base -- the graph to view, such as an AdjacencyListGraph or a CSRGraph
+		deleted_edges -- optional iterable of (u, v) pairs to delete right away
+		deleted_vertices -- optional iterable of vertices whose edges to delete right away
+		weights -- optional iterable of (u, v, weight) triples to override right away
+		"""
+		self.base = base
+		# changes[u] maps v to None if edge (u, v) is deleted, or to the Edge that replaces it.
+		self.changes = {}
+		self.deleted_vertices = set()
+		self.card_E = base.get_card_E()
+		self.version = 0  # bumped whenever this view changes
+		for u, v in deleted_edges:
+			self.delete_edge(u, v)
+		for v in deleted_vertices:
+			self.delete_vertex(v)
+		for u, v, weight in weights:
+			self.set_weight(u, v, weight)
+
+	def get_base(self):
+		"""Return the base graph."""
+		return self.base
+
+	def get_card_V(self):
+		"""Return the number of vertices in this graph."""
+		return self.base.get_card_V()
+
+	def get_card_E(self):
+		"""Return the number of edges in this graph."""
+		return self.card_E
+
+	def is_directed(self):
+		"""Return a boolean indicating whether this graph is directed."""
+		return self.base.is_directed()
+
+	def is_weighted(self):
+		"""Return a boolean indicating whether this graph is weighted."""
+		return self.base.is_weighted()
+
+	def get_version(self):
+		"""Return a value that changes whenever the base graph or this view changes."""
+		return (self.base.get_version(), self.version)
+
+	def get_adj_list(self, u):
+		"""Return an iterator for the adjacency list of vertex u.  A vertex with no
+		changed edges goes straight to the base graph's adjacency list."""
+		changes = self.changes.get(u)
+		if changes is None:
+			return self.base.get_adj_list(u)
+		return self.changed_adj_list(u, changes)
+
+	def changed_adj_list(self, u, changes):
+		"""Generate the edges of vertex u in the base graph, skipping deleted edges and
+		replacing those with overridden weights."""
+		for edge in self.base.get_adj_list(u):
+			v = edge.get_v()
+			if v in changes:
+				if changes[v] is not None:
+					yield changes[v]
+			else:
+				yield edge
+
+	def find_edge(self, u, v):
+		"""Return the edge object for edge (u, v) if (u, v) is in this graph, None otherwise.
+		An unchanged edge is the base graph's own object, so change weights with set_weight,
+		never through the edge returned."""
+		changes = self.changes.get(u)
+		if changes is not None and v in changes:
+			return changes[v]
+		return self.base.find_edge(u, v)
+
+	def has_edge(self, u, v):
+		"""Return True if edge (u, v) is in this graph, False otherwise."""
+		return self.find_edge(u, v) is not None
+
+	def change_edge(self, u, v, edge):
+		"""Record that edge (u, v) is now edge, or deleted if edge is None, in both
+		directions if this graph is undirected."""
+		self.changes.setdefault(u, {})[v] = edge
+		if not self.is_directed():
+			self.changes.setdefault(v, {})[u] = None if edge is None else Edge(u, edge.get_weight())
+		self.version += 1
+
+	def delete_edge(self, u, v, delete_undirected=True):
+		"""Delete edge (u, v) from this view if it exists.  No error if it does not exist.
+		An undirected edge is always deleted in both directions, since the view keeps
+		the two directions together."""
+		if self.has_edge(u, v):
+			self.change_edge(u, v, None)
+			self.card_E -= 1
+
+	def delete_vertex(self, v):
+		"""Delete every edge incident on vertex v, leaving v isolated."""
+		for edge in list(self.get_adj_list(v)):
+			self.delete_edge(v, edge.get_v())
+		if self.is_directed():
+			for u in range(self.get_card_V()):
+				self.delete_edge(u, v)
+		self.deleted_vertices.add(v)
+
+	def is_deleted_vertex(self, v):
+		"""Return True if vertex v was deleted with delete_vertex, False otherwise."""
+		return v in self.deleted_vertices
+
+	def set_weight(self, u, v, weight):
+		"""Override the weight of edge (u, v), which must exist in this view."""
+		if not self.is_weighted():
+			raise RuntimeError("Setting the weight of edge (" + str(u) + ", " + str(v) + ") in unweighted graph.")
+		if not self.has_edge(u, v):
+			raise RuntimeError("There is no edge (" + str(u) + ", " + str(v) + ").")
+		self.change_edge(u, v, Edge(v, weight))
+
+	def insert_edge(self, u, v, weight=None):
+		"""Edges cannot be inserted into a view, only deleted or reweighted."""
+		raise RuntimeError("Cannot insert edge (" + str(u) + ", " + str(v) + ") into a GraphOverlay.")
+
+	def copy(self):
+		"""Return a new view of the same base graph with the same changes, which can then
+		be changed independently of this one."""
+		copy = GraphOverlay(self.base)
+		copy.changes = {u: dict(changes) for u, changes in self.changes.items()}
+		copy.deleted_vertices = set(self.deleted_vertices)
+		copy.card_E = self.card_E
+		copy.version = self.version
+		return copy
+
+	def get_edge_list(self):
+		"""Return a Python list containing the edges of this graph."""
+		edge_list = []
+		for u in range(self.get_card_V()):
+			for edge in self.get_adj_list(u):
+				v = edge.get_v()
+				if self.is_directed() or u < v:
+					edge_list.append((u, v))
+		return edge_list
+
+	def transpose(self):
+		"""Return the transpose of this graph as a new AdjacencyListGraph."""
+		xpose = AdjacencyListGraph(self.get_card_V(), self.is_directed(), self.is_weighted(), indexed=True)
+		for u in range(self.get_card_V()):
+			for edge in self.get_adj_list(u):
+				v = edge.get_v()
+				if self.is_directed() or u < v:
+					xpose.insert_edge(v, u, edge.get_weight() if self.is_weighted() else None)
+		return xpose
+
+	def __str__(self):
+		"""Return the adjacency lists of this graph, formatted as a string."""
+		return self.strmap()
+
+	def strmap(self, mapping_func=None):
+		"""Return the adjacency lists of this graph, formatted as a string.
+		Vertex numbers are mapped according to a mapping function."""
+		if mapping_func is None:
+			mapping_func = lambda v: v
+		result = ""
+		for u in range(self.get_card_V()):
+			result += str(mapping_func(u)) + ": " + ", ".join(edge.strmap(mapping_func) for edge in self.get_adj_list(u)) + "\n"
+		return result
+
+
+# Testing
+if __name__ == "__main__":
+
+	from dijkstra import dijkstra_lazy
+
+	# Example from mst.py.
+	vertices = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i']
+	edges = [('a', 'b', 4), ('a', 'h', 8), ('b', 'c', 8), ('b', 'h', 11), ('c', 'd', 7),
+			 ('c', 'f', 4), ('c', 'i', 2), ('d', 'e', 9), ('d', 'f', 14), ('e', 'f', 10),
+			 ('f', 'g', 2), ('g', 'h', 1), ('g', 'i', 6), ('h', 'i', 7)]
+	graph1 = AdjacencyListGraph(len(vertices), False, True, indexed=True)
+	for edge in edges:
+		graph1.insert_edge(vertices.index(edge[0]), vertices.index(edge[1]), edge[2])
+
+	# Close c-f and make g-h slower; the base graph is unchanged.
+	view1 = GraphOverlay(graph1, deleted_edges=[(vertices.index('c'), vertices.index('f'))],
+						 weights=[(vertices.index('g'), vertices.index('h'), 5)])
+	print(view1.strmap(lambda v: vertices[v]))
+	print(graph1.get_card_E(), view1.get_card_E())
+
+	# Distances must match a graph built with the same changes.  (AdjacencyListGraph.copy
+	# shares its Edge objects with the original, so it cannot be reweighted on its own.)
+	graph2 = AdjacencyListGraph(len(vertices), False, True)
+	for u, v, weight in edges:
+		if (u, v) != ('c', 'f'):
+			graph2.insert_edge(vertices.index(u), vertices.index(v), 5 if (u, v) == ('g', 'h') else weight)
+	print(all(dijkstra_lazy(view1, s)[0] == dijkstra_lazy(graph2, s)[0] for s in range(len(vertices))))
+	print(dijkstra_lazy(graph1, vertices.index('c'))[0], dijkstra_lazy(view1, vertices.index('c'))[0])
+
+	# Deleting a vertex isolates it; copies change independently.
+	view2 = view1.copy()
+	view2.delete_vertex(vertices.index('g'))
+	print(view1.get_card_E(), view2.get_card_E(), list(view2.get_adj_list(vertices.index('g'))))
+	print(dijkstra_lazy(view2, 0)[0])
+
+	# Raising a weight in a scenario repairs copies of the trees and leaves the base alone.
+	from dynamic_shortest_paths import DynamicAllPairs
+	base = DynamicAllPairs(graph1)
+	base_weights = [(u, v, graph1.find_edge(u, v).get_weight()) for u in range(len(vertices))
+					for v in range(len(vertices)) if graph1.has_edge(u, v)]
+	base_version = graph1.get_version()
+	scenario = DynamicAllPairs(GraphOverlay(graph1), trees=base.copy_trees())
+	scenario.increase_weights([(vertices.index('a'), vertices.index('b'), 10)])
+	print(all(graph1.find_edge(u, v).get_weight() == weight for u, v, weight in base_weights),
+		  graph1.get_version() == base_version,
+		  all(base.get_tree(s)[0] == dijkstra_lazy(graph1, s)[0] for s in range(len(vertices))),
+		  scenario.get_graph().find_edge(vertices.index('b'), vertices.index('a')).get_weight())
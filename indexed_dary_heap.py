@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# indexed_dary_heap.py
+
+
+class IndexedDaryHeap:
+
+	def __init__(self, n, d=4):
+		"""Initialize an empty min-priority queue of the integers 0, 1, ..., n-1, such as
+		vertex indices, implemented as a d-ary heap.  Keys and heap positions are kept in
+		flat lists indexed by the integer itself, so there is no dictionary of positions
+		and no key function to call.  A wider heap is shallower, so decrease_key, which
+		sifts up, takes O(log_d n) time, and extract_min, which sifts down, O(d log_d n).
+
+		Arguments:
+		n -- number of possible elements
+		d -- number of children of each node, at least 2
+		"""
+		if d < 2:
+			raise RuntimeError("A d-ary heap needs d >= 2, not " + str(d) + ".")
+		self.d = d
+		self.heap = []  # the elements, in heap order
+		self.key = [float('inf')] * n  # key[x] is the key of element x
+		self.position = [-1] * n  # position[x] is x's index in heap, or -1 if x is not in the heap
+
+	def get_size(self):
+		"""Return the number of elements in the heap."""
+		return len(self.heap)
+
+	def contains(self, x):
+		"""Return True if x is in the heap, False otherwise."""
+		return self.position[x] >= 0
+
+	def get_key(self, x):
+		"""Return the key of x."""
+		return self.key[x]
+
+	def minimum(self):
+		"""Return the element with the minimum key, without removing it."""
+		if not self.heap:
+			raise RuntimeError("Heap underflow.")
+		return self.heap[0]
+
+	def insert(self, x, k):
+		"""Insert element x, which must not be in the heap, with key k."""
+		if self.position[x] >= 0:
+			raise RuntimeError("Element " + str(x) + " is already in the heap.")
+		self.key[x] = k
+		self.heap.append(x)
+		self.position[x] = len(self.heap) - 1
+		self.sift_up(len(self.heap) - 1)
+
+	def decrease_key(self, x, k):
+		"""Decrease the key of element x, which must be in the heap, to k.  Error if k is
+		greater than x's current key."""
+		if self.position[x] < 0:
+			raise RuntimeError("Element " + str(x) + " is not in the heap.")
+		if k > self.key[x]:
+			raise RuntimeError("Error in decrease_key: new key " + str(k)
+							   + " is greater than current key " + str(self.key[x]))
+		self.key[x] = k
+		self.sift_up(self.position[x])
+
+	def insert_or_decrease(self, x, k):
+		"""Insert x with key k if it is not in the heap, or else decrease its key to k."""
+		if self.position[x] >= 0:
+			self.decrease_key(x, k)
+		else:
+			self.insert(x, k)
+
+	def extract_min(self):
+		"""Remove and return the element with the minimum key."""
+		heap = self.heap
+		if not heap:
+			raise RuntimeError("Heap underflow.")
+		top = heap[0]
+		last = heap.pop()
+		self.position[top] = -1
+		if heap:
+			heap[0] = last
+			self.position[last] = 0
+			self.sift_down(0)
+		return top
+
+	def sift_up(self, i):
+		"""Move the element at index i up until its parent's key is no greater.  Iterative,
+		and the moving element is written only once, at its final position."""
+		heap, key, position, d = self.heap, self.key, self.position, self.d
+		x = heap[i]
+		k = key[x]
+		while i > 0:
+			parent = (i - 1) // d
+			y = heap[parent]
+			if key[y] <= k:
+				break
+			heap[i] = y  # move the parent down
+			position[y] = i
+			i = parent
+		heap[i] = x
+		position[x] = i
+
+	def sift_down(self, i):
+		"""Move the element at index i down until no child has a smaller key.  Iterative,
+		and the moving element is written only once, at its final position."""
+		heap, key, position, d = self.heap, self.key, self.position, self.d
+		size = len(heap)
+		x = heap[i]
+		k = key[x]
+		while True:
+			first = d * i + 1
+			if first >= size:
+				break
+			# Find the child with the smallest key.
+			smallest = first
+			smallest_key = key[heap[first]]
+			for child in range(first + 1, min(first + d, size)):
+				if key[heap[child]] < smallest_key:
+					smallest = child
+					smallest_key = key[heap[child]]
+			if k <= smallest_key:
+				break
+			y = heap[smallest]
+			heap[i] = y  # move the child up
+			position[y] = i
+			i = smallest
+		heap[i] = x
+		position[x] = i
+
+	def is_heap(self):
+		"""Return True if the heap property and the positions hold, False otherwise."""
+		for i in range(len(self.heap)):
+			if self.position[self.heap[i]] != i:
+				return False
+			if i > 0 and self.key[self.heap[(i - 1) // self.d]] > self.key[self.heap[i]]:
+				return False
+		return True
+
+
+# Testing
+if __name__ == "__main__":
+
+	import random
+
+	random.seed(1828)
+	all_equal = True
+	for d in [2, 3, 4, 8]:
+		n = 500
+		queue = IndexedDaryHeap(n, d)
+		keys = {}
+		for x in random.sample(range(n), 300):
+			keys[x] = random.randint(0, 10000)
+			queue.insert(x, keys[x])
+		for x in random.sample(sorted(keys), 100):
+			keys[x] -= random.randint(0, 5000)
+			queue.decrease_key(x, keys[x])
+		if not queue.is_heap():
+			all_equal = False
+		extracted = []
+		while queue.get_size() > 0:
+			extracted.append(queue.get_key(queue.extract_min()))
+		if extracted != sorted(keys.values()):
+			all_equal = False
+	print("All extractions are " + ("not " if not all_equal else "") + "in order")
+
+	queue = IndexedDaryHeap(3)
+	queue.insert_or_decrease(2, 5)
+	queue.insert_or_decrease(2, 1)
+	print(queue.minimum(), queue.get_key(2), queue.contains(0))
+	try:
+		queue.decrease_key(2, 7)
+	except RuntimeError as e:
+		print(e)
+
+	# Decreasing the key of an element not in the heap leaves the heap unchanged.
+	queue = IndexedDaryHeap(4)
+	for x in [1, 2, 3]:
+		queue.insert(x, x)
+	try:
+		queue.decrease_key(0, 1)
+	except RuntimeError as e:
+		print(e)
+	print(queue.is_heap(), queue.contains(3), queue.contains(0))
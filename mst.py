@@ -30,10 +30,13 @@
 #                                                                       #
 #########################################################################
 
-from merge_sort import merge_sort
+from numbers import Integral
+import numpy as np
+from bottom_up_merge_sort import bottom_up_merge_sort
 from adjacency_list_graph import AdjacencyListGraph
-from disjoint_set_forest import make_set, find_set, union
+from disjoint_set_forest import DisjointSet
 from min_heap_priority_queue import MinHeapPriorityQueue
+from indexed_dary_heap import IndexedDaryHeap
 
 
 class KruskalEdge:
@@ -74,10 +77,8 @@ def kruskal(G):
     card_V = G.get_card_V()
     # Initialize an undirected, weighted, minimum spanning tree.
     mst = AdjacencyListGraph(card_V, False, True)
-    # Keep an array of handles to disjoint-set objects.
-    forest = [None] * card_V
-    for v in range(card_V):
-        forest[v] = make_set(v)
+    # Keep the trees of the growing forest as disjoint sets of vertex indices.
+    forest = DisjointSet(card_V)
 
     # Make an array of weighted edges and sort it by weight.
     edges = []
@@ -86,26 +87,100 @@ def kruskal(G):
         for edge in G.get_adj_list(u):
             if u < edge.v:  # append edge only once
                 edges.append(KruskalEdge(u, edge.get_v(), edge.get_weight()))
-    merge_sort(edges)  # sort in nondecreasing order by weight
+    bottom_up_merge_sort(edges, key=KruskalEdge.get_weight)  # sort in nondecreasing order by weight, stably
 
     # Examine each edge.
     for edge in edges:
-        u = forest[edge.get_u()]
-        v = forest[edge.get_v()]
         # If the endpoints are not in the same tree, connect the trees.
-        if find_set(u) != find_set(v):
+        if forest.union(edge.get_u(), edge.get_v()):
             mst.insert_edge(edge.get_u(), edge.get_v(), edge.get_weight())
-            union(u, v)
+            if mst.get_card_E() == card_V - 1:  # a spanning tree is complete
+                break
 
     return mst
 
 
-def prim(G, r):
+def edge_order(weights):
+    """Return the indices of weights in nondecreasing order of weight, breaking ties by
+    index (a stable sort).  Small integer weights, such as whole minutes, are sorted by
+    counting sort in O(n + range) time; other weights by NumPy's stable argsort."""
+    if not weights:
+        return []
+    if all(isinstance(weight, Integral) for weight in weights):
+        low = min(weights)
+        weight_range = max(weights) - low + 1
+        if weight_range <= 2 * len(weights):
+            # One bucket per weight, filled in index order, so equal weights keep their order.
+            buckets = [[] for i in range(weight_range)]
+            for i, weight in enumerate(weights):
+                buckets[weight - low].append(i)
+            return [i for bucket in buckets for i in bucket]
+    return np.argsort(np.asarray(weights), kind='stable').tolist()
+
+
+def kruskal_arrays(G):
+    """Return the minimum spanning tree of a weighted, undirected graph G using Kruskal's
+    algorithm, with the edges held in parallel u, v and weight lists instead of
+    KruskalEdge objects.  The edges are ordered by edge_order, and the loop stops as soon
+    as card_V - 1 edges have been accepted.  Gives the same tree as kruskal."""
+    if G.is_directed():
+        raise RuntimeError("Graph should be undirected.")
+
+    card_V = G.get_card_V()
+    mst = AdjacencyListGraph(card_V, False, True)
+    forest = DisjointSet(card_V)
+
+    # Pull each edge once into parallel lists.
+    us, vs, weights = [], [], []
+    for u in range(card_V):
+        for edge in G.get_adj_list(u):
+            v = edge.get_v()
+            if u < v:
+                us.append(u)
+                vs.append(v)
+                weights.append(edge.get_weight())
+
+    # Examine the edges in nondecreasing order of weight.
+    for i in edge_order(weights):
+        if forest.union(us[i], vs[i]):
+            mst.insert_edge(us[i], vs[i], weights[i])
+            if mst.get_card_E() == card_V - 1:  # a spanning tree is complete
+                break
+
+    return mst
+
+
+def kruskal_stream(card_V, sorted_edges):
+    """Return the minimum spanning forest of an undirected graph whose edges arrive as a
+    stream, already in nondecreasing order of weight, such as from
+    external_sort.external_sort_edges.  Only the disjoint sets and the tree are kept in
+    memory, and the stream is closed as soon as card_V - 1 edges have been accepted.
+
+    Arguments:
+    card_V -- number of vertices
+    sorted_edges -- iterable of (u, v, weight) triples in nondecreasing order of weight
+    """
+    mst = AdjacencyListGraph(card_V, False, True)
+    forest = DisjointSet(card_V)
+    edges = iter(sorted_edges)
+    for u, v, weight in edges:
+        if u != v and forest.union(u, v):
+            mst.insert_edge(u, v, weight)
+            if mst.get_card_E() == card_V - 1:  # a spanning tree is complete
+                break
+    if hasattr(edges, "close"):
+        edges.close()  # let a generator clean up, such as deleting its temporary files
+    return mst
+
+
+def prim(G, r, heap_arity=None):
     """ Return the minimum spanning tree of a weighted, undirected graph G using Prim's algorithm.
 
     Arguments:
     G -- an undirected graph, represented by adjacency lists
     r -- root vertex to start from
+    heap_arity -- if given, use an IndexedDaryHeap with this many children per node as
+    the priority queue, instead of a MinHeapPriorityQueue
     """
     # Initialize keys and predecessors.
     card_V = G.get_card_V()
@@ -114,6 +189,22 @@ def prim(G, r):
     key = [float('inf')] * card_V  # vertices not yet in MST
     key[r] = 0  # root r has key 0
 
+    if heap_arity is not None:
+        # Vertices enter the queue only when they are first reached.
+        queue = IndexedDaryHeap(card_V, heap_arity)
+        queue.insert(r, 0)
+        while queue.get_size() > 0:
+            u = queue.extract_min()  # add u to the tree
+            visited[u] = True
+            for edge in G.get_adj_list(u):
+                v = edge.get_v()
+                weight = edge.get_weight()
+                if not visited[v] and weight < key[v]:
+                    pi[v] = u
+                    key[v] = weight
+                    queue.insert_or_decrease(v, weight)
+        return prim_tree(card_V, pi, key)
+
     # Initialize the min-priority queue of vertices.
     queue = MinHeapPriorityQueue(lambda u: key[u])
     for u in range(card_V):
@@ -130,6 +221,11 @@ def prim(G, r):
                 key[v] = weight
                 queue.decrease_key(v, weight) 	# update v in the min-priority queue
 
+    return prim_tree(card_V, pi, key)
+
+
+def prim_tree(card_V, pi, key):
+    """Return the MST found by Prim's algorithm from its predecessors and keys."""
     # Make the MST as an undirected, weighted graph.
     mst = AdjacencyListGraph(card_V, False, True)
     for i in range(card_V):
@@ -180,6 +276,7 @@ if __name__ == "__main__":
     print_undirected_edges(kruskal1, vertices)
     kruskal_weight = get_total_weight(kruskal1)
     print("Kruskal weight =", kruskal_weight)
+    print(sorted(kruskal_arrays(graph1).get_edge_list()) == sorted(kruskal1.get_edge_list()))
     print("MST with Prim's algorithm:")
     prim1 = prim(graph1, 0)
     print_undirected_edges(prim1, vertices)
@@ -198,6 +295,7 @@ if __name__ == "__main__":
     print_undirected_edges(kruskal2, vertices)
     kruskal_weight2 = get_total_weight(kruskal2)
     print("Kruskal weight =", kruskal_weight2)
+    print(sorted(kruskal_arrays(graph2).get_edge_list()) == sorted(kruskal2.get_edge_list()))
     print("MST with Prim's algorithm:")
     prim2 = prim(graph2, 0)
     print_undirected_edges(prim2, vertices)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# path_cache.py
+
+from collections import OrderedDict
+from print_path import iter_path
+
+
+class ShortestPathCache:
+
+	def __init__(self, max_entries=64):
+		"""Initialize a cache of shortest-path trees, one per (graph, graph version, source,
+		engine).  The engine fixes the weight type: dijkstra or dijkstra_lazy on a graph
+		weighted by time, bfs for the number of stops.  Each entry holds the d and pi lists
+		of a single-source search, so it takes memory proportional to the number of
+		vertices.  When the cache is full, the least recently used tree is evicted.
+
+		Graphs are compared by identity, and the version from G.get_version() is part of
+		the key, so inserting, deleting or reweighting an edge with the graph's set_weight
+		makes the graph's old trees unreachable.  They are then evicted like any other
+		unused entry.  Changing a weight on an Edge object directly, with Edge.set_weight,
+		does not change the version; call clear() after doing so.
+
+		Arguments:
+		max_entries -- maximum number of trees to keep
+		"""
+		if max_entries < 1:
+			raise RuntimeError("A ShortestPathCache must hold at least one tree.")
+		self.max_entries = max_entries
+		self.trees = OrderedDict()  # least recently used first
+		self.hits = 0
+		self.misses = 0
+
+	def __len__(self):
+		"""Return the number of trees in the cache."""
+		return len(self.trees)
+
+	def get_hits(self):
+		"""Return the number of lookups answered from the cache."""
+		return self.hits
+
+	def get_misses(self):
+		"""Return the number of lookups that had to run a search."""
+		return self.misses
+
+	def clear(self):
+		"""Remove every tree from the cache."""
+		self.trees.clear()
+
+	def get_tree(self, G, s, engine):
+		"""Return the (d, pi) lists of engine(G, s), running the search only if the tree
+		is not already cached for the current version of G.  The lists are shared with
+		the cache, so the caller must not change them.
+
+		Arguments:
+		G -- the graph
+		s -- index of the source vertex
+		engine -- a single-source search returning (d, pi), such as dijkstra or bfs
+		"""
+		key = (G, G.get_version(), s, engine)
+		tree = self.trees.get(key)
+		if tree is not None:
+			self.hits += 1
+			self.trees.move_to_end(key)  # now the most recently used
+			return tree
+		self.misses += 1
+		tree = engine(G, s)
+		self.trees[key] = tree
+		if len(self.trees) > self.max_entries:
+			self.trees.popitem(last=False)
+		return tree
+
+	def query(self, G, s, t, engine):
+		"""Find a shortest path from s to t from the cached tree for source s.
+
+		Returns:
+		path -- list of vertex indices from s to t, or [] if t is unreachable
+		cost -- weight of the path, or infinity if t is unreachable
+		"""
+		d, pi = self.get_tree(G, s, engine)
+		if d[t] == float('inf'):
+			return [], float('inf')
+		path = list(iter_path(pi, s, t))
+		path.reverse()
+		return path, d[t]
+
+
+# Testing
+if __name__ == "__main__":
+
+	import random
+	from adjacency_list_graph import AdjacencyListGraph
+	from dijkstra import dijkstra
+
+	random.seed(1828)
+	card_V = 50
+	graph1 = AdjacencyListGraph(card_V, False, True, indexed=True)
+	for u in range(card_V):
+		for v in range(u + 1, card_V):
+			if random.random() < 0.1:
+				graph1.insert_edge(u, v, random.randint(1, 10))
+
+	cache = ShortestPathCache(max_entries=4)
+	all_equal = True
+	for trial in range(200):
+		s, t = random.randrange(6), random.randrange(card_V)
+		path, cost = cache.query(graph1, s, t, dijkstra)
+		if cost != dijkstra(graph1, s)[0][t]:
+			all_equal = False
+	print("All cached distances are " + ("not " if not all_equal else "") + "equal")
+	print(len(cache), cache.get_hits(), cache.get_misses())
+
+	# Deleting an edge on a cached path must not give the old answer.
+	path, cost = cache.query(graph1, 0, card_V - 1, dijkstra)
+	graph1.delete_edge(path[0], path[1])
+	print(cache.query(graph1, 0, card_V - 1, dijkstra)[1] == dijkstra(graph1, 0)[0][card_V - 1])
@@ -30,11 +30,29 @@
 #                                                                       #
 #########################################################################
 
+def iter_path(pi, s, v):
+	"""Generate the vertices on the path from s to v lazily, starting at v and following
+	predecessors back toward s.  The last vertex generated is s if a path exists; the
+	walk stops early, at a vertex with no predecessor, if it does not.
+
+	Inputs:
+	pi: vertex predecessors on the path from s to v
+	s: source vertex for the path
+	v: end vertex for the path
+	"""
+	yield v
+	while v != s and pi[v] is not None:
+		v = pi[v]
+		yield v
+
+
 def print_path(pi, s, v, mapping_func):
 	"""Return a path of the vertices on a path from s to v as a list.
-	Returns [None] if no path from s to v exists.
+	Returns None if no path from s to v exists.
 	Differs from Print-Path in the textbook because this function does not actually print.
-	It is up to the caller to print.
+	It is up to the caller to print.  It also walks the predecessors iteratively rather
+	than recursively, so that long paths neither copy the list at every level nor run
+	into the recursion limit.
 
 	Inputs:
 	pi: vertex predecessors on the path from s to v
@@ -42,9 +60,70 @@ def print_path(pi, s, v, mapping_func):
 	v: end vertex for the path
 	mapping_func: function to map vertex numbers to what they print as
 	"""
-	if v == s:
-		return [mapping_func(s)]
-	elif pi[v] is None:
+	path = list(iter_path(pi, s, v))
+	if path[-1] != s:
 		return None
-	else:
-		return print_path(pi, s, pi[v], mapping_func) + [mapping_func(v)]
+	path.reverse()
+	return [mapping_func(u) for u in path]
+
+
+def print_paths(pi, s, targets, mapping_func):
+	"""Return the paths from s to each of several targets, as a list of lists in the
+	same order as targets, with None for a target that s cannot reach.  The vertices on
+	all the paths form a tree rooted at s, which is walked once, depth first, with the
+	current path kept on one stack.  Shared prefixes are therefore mapped only once, and
+	the work is linear in the size of the tree plus the total length of the paths.
+
+	Inputs:
+	pi: vertex predecessors, as from a single-source search from s
+	s: source vertex for the paths
+	targets: end vertices for the paths
+	mapping_func: function to map vertex numbers to what they print as
+	"""
+	targets = list(targets)
+	children = {s: []}  # children[u] lists the vertices after u on some path in the tree
+	unreachable = set()
+	for v in targets:
+		# Walk back until reaching the tree built so far or a dead end.
+		walk = []
+		while v not in children and v not in unreachable and pi[v] is not None:
+			walk.append(v)
+			v = pi[v]
+		if v in children:
+			for u in reversed(walk):
+				children[v].append(u)
+				children[u] = []
+				v = u
+		else:
+			unreachable.update(walk)
+			unreachable.add(v)
+
+	# Walk the tree depth first, copying the current path at each target.
+	is_target = set(targets)
+	found = {}
+	path = []
+	stack = [(s, 0)]  # each vertex with the length of the path before it
+	while stack:
+		u, depth = stack.pop()
+		del path[depth:]
+		path.append(mapping_func(u))
+		if u in is_target:
+			found[u] = list(path)
+		stack.extend((w, depth + 1) for w in children[u])
+	return [found.get(v) for v in targets]
+
+
+# Testing
+if __name__ == "__main__":
+
+	# A chain much longer than the recursion limit.
+	card_V = 100000
+	pi = [None] + list(range(card_V - 1))
+	print(len(print_path(pi, 0, card_V - 1, lambda i: i)))
+
+	# A small tree with an unreachable vertex 6.
+	pi = [None, 0, 1, 1, 0, 4, None]
+	for v in range(7):
+		print(v, print_path(pi, 0, v, lambda i: i), list(iter_path(pi, 0, v)))
+	print(print_paths(pi, 0, [3, 2, 6, 5, 0, 3], lambda i: "v" + str(i)))
+	print(print_paths(pi, 0, range(7), lambda i: i) == [print_path(pi, 0, v, lambda i: i) for v in range(7)])
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# station_index.py
+
+
+class StationIndex(dict):
+
+	def __init__(self, names=()):
+		"""Initialize a two-way mapping between station names and indices.
+		As a dictionary it maps each name to its index; get_name maps an index back
+		to its name in constant time.  Indices are handed out in order from 0.
+
+		Arguments:
+		names -- optional iterable of distinct names, given indices 0, 1, 2, ... in order
+		"""
+		dict.__init__(self)
+		self.names = []  # names[i] is the name of the station with index i
+		for name in names:
+			self.add(name)
+
+	@staticmethod
+	def from_mapping(mapping):
+		"""Return a StationIndex holding the same name-to-index pairs as a dictionary whose
+		indices are exactly 0, 1, ..., len(mapping) - 1."""
+		return StationIndex(sorted(mapping, key=mapping.get))
+
+	def add(self, name):
+		"""Give name the next free index, unless it already has one.  Return its index."""
+		if name not in self:
+			self[name] = len(self.names)
+		return dict.__getitem__(self, name)
+
+	def __setitem__(self, name, index):
+		"""Add a new name, which must take the next free index."""
+		if name in self:
+			raise RuntimeError("Station " + str(name) + " already has index " + str(dict.__getitem__(self, name)) + ".")
+		if index != len(self.names):
+			raise RuntimeError("Station " + str(name) + " must take the next free index " + str(len(self.names)) + ".")
+		dict.__setitem__(self, name, index)
+		self.names.append(name)
+
+	def update(self, *args, **kwargs):
+		"""Add each new name with its index, checking indices as __setitem__ does."""
+		for name, index in dict(*args, **kwargs).items():
+			self[name] = index
+
+	def setdefault(self, name, index=None):
+		"""Return the index of name, adding it with the given index if it is new."""
+		if name not in self:
+			self[name] = index
+		return dict.__getitem__(self, name)
+
+	def __delitem__(self, name):
+		"""Stations cannot be removed, since that would leave a gap in the indices."""
+		raise RuntimeError("Cannot remove station " + str(name) + " from a StationIndex.")
+
+	def pop(self, name, *default):
+		"""Stations cannot be removed."""
+		raise RuntimeError("Cannot remove station " + str(name) + " from a StationIndex.")
+
+	def popitem(self):
+		"""Stations cannot be removed."""
+		raise RuntimeError("Cannot remove stations from a StationIndex.")
+
+	def clear(self):
+		"""Stations cannot be removed."""
+		raise RuntimeError("Cannot remove stations from a StationIndex.")
+
+	def get_name(self, index):
+		"""Return the name of the station with the given index, or None if there is none."""
+		if 0 <= index < len(self.names):
+			return self.names[index]
+		return None
+
+	def get_names(self):
+		"""Return the list of names, in index order."""
+		return self.names
+
+	def __reduce__(self):
+		"""Pickle as the list of names, so that unpickling rebuilds both directions."""
+		return (StationIndex, (self.names,))
+
+
+# Testing
+if __name__ == "__main__":
+
+	import pickle
+
+	stations = StationIndex(["Angel", "Bank", "Euston"])
+	print(stations["Bank"], stations.get_name(2), stations.get_name(3))
+	print(stations.add("Oval"), stations.add("Angel"), len(stations))
+	print(stations == {"Angel": 0, "Bank": 1, "Euston": 2, "Oval": 3})
+	print(StationIndex.from_mapping({"Euston": 1, "Angel": 0}).get_names())
+	copy = pickle.loads(pickle.dumps(stations))
+	print(copy == stations, copy.get_names() == stations.get_names())
+	try:
+		stations["Temple"] = 7
+	except RuntimeError as e:
+		print(e)
@@ -7,14 +7,14 @@ def main():
     data_file = 'London Underground data.xlsx'
 
     # Attempt to prepare the data for use in the route planner
-    preparation_result = functions.prepare_data(data_file)
+    preparation_result = functions.prepare_network(data_file)
 
     # Exit the program if the data could not be loaded properly
     if preparation_result is None:
         return
 
     # Unpack the preparation results into usable variables
-    data, station_map, edges_dict = preparation_result
+    station_map, edges_dict = preparation_result
 
     # Construct the graph representation of the London Underground
     graph = functions.create_graph(station_map, edges_dict, 'time')
@@ -26,7 +26,7 @@ def main():
     end_station = input("Enter the end station: ").strip()
 
     # Utilize the Dijkstra algorithm to find the shortest path and the total journey time
-    path, total_time = functions.find_shortest_path(graph, station_map, start_station, end_station, functions.dijkstra)
+    path, total_time = functions.find_shortest_path(graph, station_map, start_station, end_station, functions.dijkstra_lazy)
 
     # Display the results to the user
     if path:
@@ -38,7 +38,7 @@ def main():
         print("No path could be found between the selected stations.")
 
     # Compute the journey times for all station pairs to be used in the histogram
-    times = functions.calculate_all_journeys(graph, graph, station_map, functions.dijkstra, 'time')
+    times = functions.calculate_all_journeys(graph, graph, station_map, functions.dijkstra_lazy, 'time')
 
     # Generate and display a histogram of journey times across the London Underground
     functions.plot_single_histogram(times, title='Histogram of Journey Times',
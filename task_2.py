@@ -7,14 +7,14 @@ def main():
     data_file = 'London Underground data.xlsx'
 
     # Process the data file, ensuring that it is loaded correctly for further operations
-    preparation_result = functions.prepare_data(data_file)
+    preparation_result = functions.prepare_network(data_file)
 
     # If the data preparation fails, exit the function to prevent further errors
     if preparation_result is None:
         return  # Data loading error handling
 
     # Unpack the returned tuple into separate variables for use in graph creation
-    data, station_map, edges_dict = preparation_result
+    station_map, edges_dict = preparation_result
 
     # Build the graph structure for the stations, using stops as the weight type for edges
     graph = functions.create_graph(station_map, edges_dict, 'stops')
@@ -24,7 +24,7 @@ def main():
     end_station = input("Enter the end station: ").strip()
 
     # Calculate the shortest path between the entered stations using the Dijkstra algorithm
-    path, total_stops = functions.find_shortest_path(graph, station_map, start_station, end_station, functions.dijkstra)
+    path, total_stops = functions.find_shortest_path(graph, station_map, start_station, end_station, functions.dijkstra_lazy)
 
     # Provide feedback to the user based on the path calculation results
     if path:
@@ -36,7 +36,7 @@ def main():
         print("No path could be found between the selected stations.")
 
     # Compute the count of stops for all possible journeys between station pairs
-    stops = functions.calculate_all_journeys(graph, graph, station_map, functions.dijkstra, 'stops')
+    stops = functions.calculate_all_journeys(graph, graph, station_map, functions.dijkstra_lazy, 'stops')
 
     # Generate and display a histogram that visualizes the distribution of stop counts
     functions.plot_single_histogram(stops, title='Histogram of Journey Stops', xlabel='Number of Stops')
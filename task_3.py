@@ -7,14 +7,14 @@ def main():
     data_file = 'London Underground data.xlsx'
 
     # Load and prepare the data from the provided dataset
-    preparation_result = functions.prepare_data(data_file)
+    preparation_result = functions.prepare_network(data_file)
 
     # If the data could not be loaded properly, exit the function early
     if preparation_result is None:
         return  # Exit if data preparation is unsuccessful
 
     # Extract usable variables from the prepared data for graph construction
-    data, station_map, edges_dict = preparation_result
+    station_map, edges_dict = preparation_result
 
     # Construct a graph representation of the tube system with 'stops' as edge weights
     graph = functions.create_graph(station_map, edges_dict, 'stops')
@@ -7,25 +7,18 @@ def main():
     data_file = 'London Underground data.xlsx'
 
     # Load and prepare the data; exit if unsuccessful
-    preparation_result = functions.prepare_data(data_file)
+    preparation_result = functions.prepare_network(data_file)
     if preparation_result is None:
         return  # Early exit if data preparation fails
 
     # Unpack the data into a station map and edges dictionary for graph construction
-    data, station_map, edges_dict = preparation_result
-
-    # Update the edges dictionary to reflect both time and stops data
-    edges_dict = functions.map_stations_to_indices(data, station_map)
+    station_map, edges_dict = preparation_result
 
     # Create two separate graph representations of the tube system
     # One graph is weighted by journey time, and the other by the number of stops
     graph_time = functions.create_graph(station_map, edges_dict, 'time')
     graph_stops = functions.create_graph(station_map, edges_dict, 'stops')
 
-    # Compute initial journey metrics (times and stops) for all station pairs using Dijkstra's algorithm
-    times_before, stops_before = functions.calculate_all_journeys(graph_time, graph_stops, station_map,
-                                                                  functions.dijkstra, 'both')
-
     # Generate a Minimum Spanning Tree (MST) from the time-weighted graph to determine essential connections
     mst = functions.generate_mst(graph_time)
     # Identify which edges can be removed without disconnecting the graph, based on the MST
@@ -34,13 +27,10 @@ def main():
     # Output the list of connections that can be potentially closed
     functions.print_edges_to_remove(edges_to_remove, station_map)
 
-    # Simulate the closure of identified edges in both the time and stops graphs
-    functions.simulate_closure(graph_time, edges_to_remove)
-    functions.simulate_closure(graph_stops, edges_to_remove)
-
-    # Calculate new journey metrics (times and stops) after the simulated closures
-    times_after, stops_after = functions.calculate_all_journeys(graph_time, graph_stops, station_map,
-                                                                functions.dijkstra, 'both')
+    # Compute journey metrics (times and stops) for all station pairs with Dijkstra's algorithm, then
+    # simulate the closure of the identified edges in both graphs and repair only the affected journeys
+    (times_before, stops_before), (times_after, stops_after) = functions.calculate_closure_journeys(
+        graph_time, graph_stops, edges_to_remove, 'both')
 
     # Plot and compare histograms before and after the simulated closures
     # Histograms provide a visual representation of journey times and the number of stops distribution